@@ -0,0 +1,237 @@
+# -------------------------------------------------------------------------------
+# Name:        refactoring
+# Purpose:     End-to-end refactoring benchmark.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+End-to-end refactoring benchmark.
+
+Each scenario performs what the corresponding dialog or action does,
+in a fresh interpreter on a fresh copy of a synthetic project:
+
+- rename: Rename the widely used function `core.common.helper` (`RenameDialog`).
+- rename_parallel: The same rename, searched by one worker process per CPU.
+  It is not run by default.
+- move_global: Move the global `core.common.CONSTANT` to `core/legacy.py` (`MoveDialog`).
+- move_module: Move the module `core/legacy.py` to the package `pkg0` (`MoveDialog`).
+- to_package: Convert the module `core/legacy.py` to a package (`MainWindow.module2package`).
+
+For each scenario, the time to compute and to perform the changes, the peak memory
+and the number of files touched are reported.
+
+Each size is first calibrated: plain rope, without pruning or summaries, parses every
+module of the same project, in a fresh interpreter too. The total time and peak memory
+of each scenario are also reported relative to the calibration, as `total_ratio` and
+`peak_memory_ratio`, which hardly depend on the machine running the benchmark.
+
+Usage::
+
+    python benchmark/refactoring.py [--sizes 1000 10000] [--scenarios ...] [--output FILE]
+        [--thresholds FILE]
+
+The run fails when a measurement exceeds its threshold in `refactoring_thresholds.json`,
+whose entries look like `{"<size>": {"<scenario>": {"<measurement>": <maximum>}}}`.
+Only the ratios and the number of files touched have thresholds. They are those of a
+baseline run plus a tolerance: 50% on `total_ratio`, and at least 0.1 for the scenarios
+lasting milliseconds, 25% on `peak_memory_ratio`, none on `files_touched`.
+Take a new baseline whenever an optimization lands, or the regressions it undoes go
+unnoticed.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+CALIBRATION = "calibration"
+RESULTS = Path(__file__).resolve().parent / "results"
+THRESHOLDS = Path(__file__).resolve().parent / "refactoring_thresholds.json"
+
+
+def _get_offset(project, path: str, text: str) -> int:
+    return project.get_resource(path).read().index(text)
+
+
+def get_changes(project, scenario: str):
+    """
+    Compute the changes of `scenario` the way the interface does.
+    """
+    # pylint:disable=import-outside-toplevel
+    from rope.refactor.move import create_move
+    from rope.refactor.topackage import ModuleToPackage
+
+    from refactorings import (
+        OccurrenceRename,
+        get_move_destination,
+        get_move_resources,
+    )
+
+    common = project.get_resource("core/common.py")
+    legacy = project.get_resource("core/legacy.py")
+
+    if scenario in ("rename", "rename_parallel"):
+        offset = _get_offset(project, "core/common.py", "helper")
+        processes = os.cpu_count() if scenario == "rename_parallel" else 0
+        rename = OccurrenceRename(project, common, offset, processes)
+        return rename.get_changes("shared_helper")
+    if scenario == "move_global":
+        offset = _get_offset(project, "core/common.py", "CONSTANT")
+        move = create_move(project, common, offset)
+        destination = get_move_destination(project, move, legacy.path)
+        return move.get_changes(
+            destination, resources=get_move_resources(move, destination)
+        )
+    if scenario == "move_module":
+        move = create_move(project, legacy)
+        destination = get_move_destination(project, move, "pkg0")
+        return move.get_changes(
+            destination, resources=get_move_resources(move, destination)
+        )
+    if scenario == "to_package":
+        return ModuleToPackage(project, legacy).get_changes()
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def calibrate(project_path: Path) -> dict[str, float]:
+    """
+    Parse every module of the project with plain rope, in the current interpreter.
+    """
+    # pylint:disable=import-outside-toplevel
+    from rope.base.project import Project
+
+    project = Project(str(project_path), ropefolder=None)
+    start = time.perf_counter()
+    for module in project.get_python_files():
+        project.get_pymodule(module).get_scope()
+    total = time.perf_counter() - start
+    project.close()
+
+    # Kilobytes on Linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"total": total, "peak_memory_mb": peak / 1024}
+
+
+def measure(project_path: Path, scenario: str) -> dict[str, float]:
+    """
+    Take the measurements of one scenario, in the current interpreter.
+    """
+    if scenario == CALIBRATION:
+        return calibrate(project_path)
+
+    # pylint:disable=import-outside-toplevel
+    sys.path.insert(0, str(SRC))
+    from pruning import open_project
+
+    project = open_project(str(project_path))
+    start = time.perf_counter()
+    changes = get_changes(project, scenario)
+    computed = time.perf_counter()
+    changes.do()
+    performed = time.perf_counter()
+    project.close()
+
+    # Kilobytes on Linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "compute": computed - start,
+        "perform": performed - computed,
+        "total": performed - start,
+        "peak_memory_mb": peak / 1024,
+        "files_touched": len(changes.get_changed_resources()),
+    }
+
+
+def run(project_path: Path, scenario: str) -> dict[str, float]:
+    """
+    Take the measurements of one scenario in a fresh interpreter and project copy.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        copy = Path(workdir) / "project"
+        shutil.copytree(project_path, copy)
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", str(copy), scenario],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def check(results: dict, thresholds: dict) -> list[str]:
+    """
+    Get the measurements exceeding their thresholds.
+    """
+    failures = []
+    for size, scenarios in results.items():
+        for scenario, measurements in scenarios.items():
+            limits = thresholds.get(size, {}).get(scenario, {})
+            for name, limit in limits.items():
+                if measurements.get(name, 0) > limit:
+                    failures.append(
+                        f"{size} {scenario} {name}: {measurements[name]:.3f} > {limit}"
+                    )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["rename", "move_global", "move_module", "to_package"],
+    )
+    parser.add_argument("--output", type=Path, default=RESULTS / "refactoring.json")
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS)
+    parser.add_argument("--measure", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        project_path, scenario = args.measure
+        print(json.dumps(measure(Path(project_path), scenario)))
+        return 0
+
+    # pylint:disable=import-outside-toplevel
+    from synthetic import default_workdir, get_project
+
+    results: dict[str, dict] = {}
+    for size in args.sizes:
+        project_path = get_project(default_workdir(), size)
+        calibration = run(project_path, CALIBRATION)
+        results[str(size)] = {CALIBRATION: calibration}
+        print(size, CALIBRATION, json.dumps(calibration))
+        for scenario in args.scenarios:
+            measurements = run(project_path, scenario)
+            measurements["total_ratio"] = measurements["total"] / calibration["total"]
+            measurements["peak_memory_ratio"] = (
+                measurements["peak_memory_mb"] / calibration["peak_memory_mb"]
+            )
+            results[str(size)][scenario] = measurements
+            print(size, scenario, json.dumps(measurements))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=4))
+    print(f"Results written to {args.output}")
+
+    thresholds = {}
+    if args.thresholds.exists():
+        thresholds = json.loads(args.thresholds.read_text())
+    failures = check(results, thresholds)
+    for failure in failures:
+        print(f"Regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
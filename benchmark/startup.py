@@ -0,0 +1,213 @@
+# -------------------------------------------------------------------------------
+# Name:        startup
+# Purpose:     Startup and time-to-interactive benchmark.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Startup and time-to-interactive benchmark.
+
+Each measurement runs in a fresh interpreter with `QT_QPA_PLATFORM=offscreen`
+on a synthetic project, and times:
+
+- import: Importing `ui.mainwindow`.
+- first_paint: From constructing `MainWindow` to its first paint.
+- time_to_interactive: From interpreter start to the first paint.
+
+The steps of opening a project are timed in another fresh interpreter, so they do not
+reuse what the window already opened or listed:
+
+- project: Constructing the rope `Project`.
+- project_model: Building the project tree model and listing the root.
+- scan: Scanning the whole project as the background scanner does.
+
+Usage::
+
+    python benchmark/startup.py [--sizes 1000 10000 50000] [--repeat 3] [--output FILE]
+
+The results (median of the repeats, in seconds) are written as JSON.
+Pass `--baseline FILE` to print the relative change against a previous run.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+START = time.perf_counter()
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+RESULTS = Path(__file__).resolve().parent / "results"
+
+
+def measure_window(project_path: Path) -> dict[str, float]:
+    """
+    Time the startup of the window, in the current interpreter.
+    """
+    # pylint:disable=import-outside-toplevel
+    sys.path.insert(0, str(SRC))
+    os.chdir(project_path)
+    timings = {}
+
+    def lap(name: str, start: float) -> float:
+        now = time.perf_counter()
+        timings[name] = now - start
+        return now
+
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(["startup"])
+
+    now = time.perf_counter()
+    from ui.mainwindow import MainWindow
+
+    lap("import", now)
+
+    class PaintFilter(QObject):
+        def eventFilter(self, obj, event):  # pylint:disable=invalid-name
+            if event.type() == QEvent.Type.Paint and "first_paint" not in timings:
+                lap("first_paint", start)
+                lap("time_to_interactive", START)
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    paint_filter = PaintFilter()
+    start = time.perf_counter()
+    with MainWindow() as mainwindow:
+        mainwindow.installEventFilter(paint_filter)
+        mainwindow.show()
+        app.exec()
+
+    return timings
+
+
+def measure_steps(project_path: Path) -> dict[str, float]:
+    """
+    Time the steps of opening a project, in the current interpreter.
+    """
+    # pylint:disable=import-outside-toplevel
+    sys.path.insert(0, str(SRC))
+    timings = {}
+
+    def lap(name: str, start: float) -> float:
+        now = time.perf_counter()
+        timings[name] = now - start
+        return now
+
+    from PyQt6.QtCore import QModelIndex
+    from PyQt6.QtWidgets import QApplication
+
+    from models import ProjectModel
+    from pruning import open_project
+    from workers import ProjectScanner
+
+    app = QApplication(["startup"])  # pylint:disable=unused-variable
+
+    now = time.perf_counter()
+    project = open_project(str(project_path))
+    now = lap("project", now)
+
+    model = ProjectModel(project.root)
+    model.fetchMore(QModelIndex())
+    now = lap("project_model", now)
+
+    ProjectScanner(project.root).run()
+    lap("scan", now)
+    project.close()
+
+    return timings
+
+
+# Measurement functions by part, each run in its own interpreter.
+PARTS = {"window": measure_window, "steps": measure_steps}
+
+
+def run(project_path: Path) -> dict[str, float]:
+    """
+    Take the measurements of one run, each part in a fresh interpreter.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    timings = {}
+    for part in PARTS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", str(project_path), part],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.update(json.loads(output.splitlines()[-1]))
+    return timings
+
+
+def get_environment() -> dict[str, str]:
+    # pylint:disable=import-outside-toplevel
+    from importlib.metadata import version
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "PyQt6": version("PyQt6"),
+        "rope": version("rope"),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results: dict, baseline: dict):
+    """
+    Print the relative change of each timing against `baseline`.
+    """
+    for size, timings in results["results"].items():
+        previous = baseline["results"].get(size, {})
+        for name, value in timings.items():
+            if name in previous and previous[name] > 0:
+                change = (value - previous[name]) / previous[name]
+                print(f"{size:>8} {name:<22} {value:9.3f}s {change:+8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=RESULTS / "startup.json")
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--measure", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        project_path, part = args.measure
+        print(json.dumps(PARTS[part](Path(project_path))))
+        return
+
+    # pylint:disable=import-outside-toplevel
+    from synthetic import default_workdir, get_project
+
+    results = {"environment": get_environment(), "results": {}}
+    for size in args.sizes:
+        project_path = get_project(default_workdir(), size)
+        runs = [run(project_path) for _ in range(args.repeat)]
+        results["results"][str(size)] = {
+            name: statistics.median(timings[name] for timings in runs)
+            for name in runs[0]
+        }
+        print(size, json.dumps(results["results"][str(size)]))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=4))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -------------------------------------------------------------------------------
+# Name:        synthetic
+# Purpose:     Generate synthetic python projects for benchmarks.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Generate synthetic python projects for benchmarks.
+
+The project consists of a `core` package and nested packages named `pkg<n>`.
+`core/common.py` defines the widely used function `helper` and the global `CONSTANT`,
+and one module out of `usage_interval` uses them.
+`core/legacy.py` is a module imported by the same modules, it can be moved or converted to a package.
+"""
+import os
+import shutil
+from collections import deque
+from pathlib import Path
+
+COMMON = '''"""
+Definitions shared by the whole project.
+"""
+CONSTANT = 42
+
+
+def helper(value):
+    """Widely used function."""
+    return value + CONSTANT
+'''
+
+LEGACY = '''"""
+Legacy utilities.
+"""
+
+
+def legacy(value):
+    return value * 2
+'''
+
+USER = '''"""
+Synthetic module {index}.
+"""
+from core.common import helper, CONSTANT
+from core import legacy
+
+
+def function_{index}(value):
+    return helper(value) + legacy.legacy(CONSTANT)
+
+
+class Class{index}:
+    def method(self):
+        return function_{index}(1)
+'''
+
+PLAIN = '''"""
+Synthetic module {index}.
+"""
+
+
+def function_{index}(value):
+    return value * {index}
+
+
+class Class{index}:
+    def method(self):
+        return function_{index}(1)
+'''
+
+
+def generate(
+    root: Path,
+    modules: int,
+    modules_per_package: int = 20,
+    packages_per_package: int = 5,
+    usage_interval: int = 10,
+) -> Path:
+    """
+    Generate a project of `modules` modules under `root`, replacing its content.
+    Packages are filled breadth first, each with `modules_per_package` modules
+    and `packages_per_package` subpackages.
+    """
+    if root.exists():
+        shutil.rmtree(root)
+
+    core = root / "core"
+    core.mkdir(parents=True)
+    (core / "__init__.py").write_text("")
+    (core / "common.py").write_text(COMMON)
+    (core / "legacy.py").write_text(LEGACY)
+
+    index = 0
+    queue = deque([root / "pkg0"])
+    while index < modules:
+        package = queue.popleft()
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+
+        for _ in range(min(modules_per_package, modules - index)):
+            template = USER if index % usage_interval == 0 else PLAIN
+            (package / f"module{index}.py").write_text(template.format(index=index))
+            index += 1
+
+        name = package.name
+        queue.extend(
+            package / f"{name}_{child}" for child in range(packages_per_package)
+        )
+
+    return root
+
+
+def get_project(workdir: Path, modules: int, **kwargs) -> Path:
+    """
+    Get the project of `modules` modules in `workdir`, generating it if missing.
+    Rope data from previous runs is removed so each run starts cold.
+    """
+    root = workdir / f"project_{modules}"
+    marker = root / ".generated"
+    if not marker.exists():
+        generate(root, modules, **kwargs)
+        marker.write_text(str(modules))
+
+    shutil.rmtree(root / ".ropeproject", ignore_errors=True)
+    return root
+
+
+def default_workdir() -> Path:
+    return Path(os.environ.get("BENCHMARK_WORKDIR", Path(__file__).parent / "projects"))
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------------
+# Name:        analysis
+# Purpose:     Warm rope up before the first refactoring.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Warm rope up before the first refactoring.
+"""
+import logging
+import os
+import weakref
+from typing import Union
+
+from rope.base import libutils
+from rope.base.exceptions import ModuleSyntaxError
+from rope.base.project import Project
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
+
+from utilities import get_project_lock
+
+
+class ModuleAnalyzer:
+    """
+    Parse every module of a project and perform static object analysis on those
+    modified since they were last analyzed, so that rope does not do it lazily
+    during the first refactoring.
+
+    The results of the analysis go to rope's object DB, which is persisted in the
+    rope folder when the project is opened with `save_objectdb`. The modification
+    times of the analyzed modules are persisted next to it, so after a restart
+    the unmodified modules are only parsed.
+
+    Rope is called holding the project lock, see `get_project_lock`, one module
+    at a time, so other threads wait for one module at most. The modification
+    times are guarded by the same lock, which rope also holds when it calls `save`.
+    """
+
+    data_name = "analyzed_modules"
+
+    def __init__(self, project: Project):
+        # The project owns the analyzer through its write hook, and is shared through
+        # `get_module_analyzer`, which must not keep it alive.
+        self._project = weakref.proxy(project)
+        self._lock = get_project_lock(project)
+        # Modification time of the analyzed modules by path.
+        self._analyzed: Union[None, dict[str, int]] = None
+        project.data_files.add_write_hook(self.save)
+
+    def _load(self):
+        if self._analyzed is not None:
+            return
+
+        data = self._project.data_files.read_data(self.data_name)
+        self._analyzed = data if isinstance(data, dict) else {}
+
+    def analyze(self, task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE) -> int:
+        """
+        Parse all the modules and analyze the modified ones.
+        Returns the number of modules analyzed.
+        """
+        project = self._project
+        with self._lock:
+            self._load()
+            resources = project.get_python_files()
+        count = 0
+
+        job_set = task_handle.create_jobset("Analyzing Modules", len(resources))
+        for resource in resources:
+            job_set.started_job(resource.path)
+            try:
+                mtime = os.stat(resource.real_path).st_mtime_ns
+                with self._lock:
+                    if self._analyzed.get(resource.path) == mtime:
+                        project.get_pymodule(resource)
+                    else:
+                        libutils.analyze_module(project, resource)
+                        self._analyzed[resource.path] = mtime
+                        count += 1
+            except (OSError, ModuleSyntaxError) as exception:
+                logging.warning("Module %s not analyzed: %s", resource.path, exception)
+            job_set.finished_job()
+
+        # Forget the modules removed since.
+        paths = {resource.path for resource in resources}
+        with self._lock:
+            for path in [path for path in self._analyzed if path not in paths]:
+                del self._analyzed[path]
+
+        logging.info("Modules analyzed: %d of %d.", count, len(resources))
+        return count
+
+    def save(self):
+        """
+        Persist the modification times of the analyzed modules in the rope folder.
+        """
+        with self._lock:
+            if self._analyzed is not None:
+                self._project.data_files.write_data(self.data_name, self._analyzed)
+
+
+_module_analyzers: "weakref.WeakKeyDictionary[Project, ModuleAnalyzer]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_module_analyzer(project: Project) -> ModuleAnalyzer:
+    """
+    Get the module analyzer of `project`, shared by the whole application.
+    """
+    try:
+        return _module_analyzers[project]
+    except KeyError:
+        analyzer = _module_analyzers[project] = ModuleAnalyzer(project)
+        return analyzer
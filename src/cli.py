@@ -0,0 +1,197 @@
+# -------------------------------------------------------------------------------
+# Name:        cli
+# Purpose:     Command line entrance, without GUI.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Command line entrance, without GUI.
+It performs the same refactorings as the dialogs but never imports PyQt6,
+so it starts quickly and runs on servers without a display.
+
+Usage::
+
+    python -m cli rename FILE OFFSET NEW_NAME [--docs] [--processes N] [--scope PATH]...
+    python -m cli move FILE OFFSET DESTINATION [--scope PATH]...
+    python -m cli to-package FILE
+
+`OFFSET` is a character offset in `FILE`, or `-` to refactor the module itself.
+`--scope` restricts the refactoring to the modules under the given paths.
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import Union
+
+from rope.base import libutils
+from rope.base.change import ChangeSet
+from rope.base.exceptions import RopeError
+from rope.base.project import Project
+from rope.base.resources import File, Resource
+
+from pruning import open_project
+
+
+def _get_offset(text: str) -> Union[None, int]:
+    if text == "-":
+        return None
+    return int(text)
+
+
+def _get_resource(project: Project, path: str) -> Resource:
+    return libutils.path_to_resource(project, os.path.abspath(path))
+
+
+def _get_scope(project: Project, args: argparse.Namespace) -> Union[None, list[File]]:
+    """
+    Get the modules of the `--scope` paths, or `None` for the whole project.
+    """
+    # pylint:disable=import-outside-toplevel
+    from refactorings import get_scope_resources
+
+    if not args.scope:
+        return None
+    return get_scope_resources([_get_resource(project, path) for path in args.scope])
+
+
+def rename(project: Project, args: argparse.Namespace) -> ChangeSet:
+    """
+    Rename the identifier at `args.offset`, or the module itself.
+    """
+    # pylint:disable=import-outside-toplevel
+    from refactorings import OccurrenceRename
+
+    resource = _get_resource(project, args.file)
+    processes = args.processes
+    if processes is None:
+        processes = project.prefs.get("rename_processes", 0)
+    refactor = OccurrenceRename(project, resource, args.offset, processes)
+    return refactor.get_changes(
+        args.new_name, docs=args.docs, resources=_get_scope(project, args)
+    )
+
+
+def move(project: Project, args: argparse.Namespace) -> ChangeSet:
+    """
+    Move the global, method or module at `args.offset` to `args.destination`.
+    """
+    # pylint:disable=import-outside-toplevel
+    from rope.refactor.move import MoveMethod, create_move
+
+    from refactorings import get_move_destination, get_move_resources
+
+    resource = _get_resource(project, args.file)
+    refactor = create_move(project, resource, args.offset)
+
+    destination = args.destination
+    if not isinstance(refactor, MoveMethod):
+        destination = _get_resource(project, destination).path
+    destination = get_move_destination(project, refactor, destination)
+    resources = get_move_resources(refactor, destination, _get_scope(project, args))
+    return refactor.get_changes(destination, resources=resources)
+
+
+def to_package(project: Project, args: argparse.Namespace) -> ChangeSet:
+    """
+    Convert a python module to a package.
+    """
+    # pylint:disable=import-outside-toplevel
+    from rope.refactor.topackage import ModuleToPackage
+
+    resource = _get_resource(project, args.file)
+    if resource.is_folder() or resource.name == "__init__.py":
+        raise RopeError(f"Not a python module: {resource.path}")
+    return ModuleToPackage(project, resource).get_changes()
+
+
+def _add_scope_argument(subparser: argparse.ArgumentParser):
+    subparser.add_argument(
+        "--scope",
+        action="append",
+        metavar="PATH",
+        help="only refactor the modules under PATH, a module or folder "
+        "(repeatable, default: the whole project)",
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli", description="Refactor a python project without GUI."
+    )
+    parser.add_argument(
+        "-p",
+        "--project",
+        default=os.getcwd(),
+        help="project root directory (default: the current working directory)",
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="print the changes without performing them",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparser = subparsers.add_parser("rename", help="rename an identifier or module")
+    subparser.add_argument("file")
+    subparser.add_argument("offset", type=_get_offset)
+    subparser.add_argument("new_name")
+    subparser.add_argument(
+        "--docs", action="store_true", help="include strings and comments"
+    )
+    subparser.add_argument(
+        "--processes",
+        type=int,
+        help="search the occurrences with N worker processes "
+        "(default: the rename_processes preference, or serially)",
+    )
+    _add_scope_argument(subparser)
+    subparser.set_defaults(function=rename)
+
+    subparser = subparsers.add_parser("move", help="move a global, method or module")
+    subparser.add_argument("file")
+    subparser.add_argument("offset", type=_get_offset)
+    subparser.add_argument("destination")
+    _add_scope_argument(subparser)
+    subparser.set_defaults(function=move)
+
+    subparser = subparsers.add_parser(
+        "to-package", help="convert a module to a package"
+    )
+    subparser.add_argument("file")
+    subparser.set_defaults(function=to_package)
+
+    return parser
+
+
+def main(argv: Union[None, list[str]] = None) -> int:
+    """
+    Command line entrance. Returns the exit status.
+    """
+    args = get_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    project = open_project(args.project)
+    try:
+        changes = args.function(project, args)
+        if args.dry_run:
+            print(changes.get_description())
+        else:
+            project.do(changes)
+            for resource in sorted(changes.get_changed_resources(), key=str):
+                print(resource.path)
+        return 0
+    except (RopeError, OSError) as exception:
+        print(f"{args.command}: {exception}", file=sys.stderr)
+        return 1
+    finally:
+        project.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# -------------------------------------------------------------------------------
+# Name:        indexes
+# Purpose:     Project-level indexes, persisted between runs.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Project-level indexes, persisted between runs.
+"""
+import logging
+import os
+import threading
+import weakref
+from typing import Union
+
+from rope.base import libutils
+from rope.base.change import Change
+from rope.base.exceptions import ResourceNotFoundError
+from rope.base.project import Project
+from rope.base.resources import Resource
+
+from utilities import get_changed_folders, get_project_lock
+
+# Indexed folder: [modification time, python file names, folder names].
+_Folder = list
+
+
+class ModuleIndex:
+    """
+    Index of the python modules and packages of a project.
+
+    It is built once, persisted in the rope folder and updated incrementally.
+    Each folder remembers its modification time, which changes when an entry is
+    created, moved or deleted, so only the altered folders are listed again.
+    The folders are listed holding the project lock, see `get_project_lock`,
+    one at a time.
+    """
+
+    data_name = "module_index"
+
+    def __init__(self, project: Project):
+        # The project owns the index through its write hook, and is shared through
+        # `get_module_index`, which must not keep it alive.
+        self._project = weakref.proxy(project)
+        self._project_lock = get_project_lock(project)
+        self._lock = threading.RLock()
+        self._folders: Union[None, dict[str, _Folder]] = None
+        project.data_files.add_write_hook(self.save)
+
+    def _get_real_path(self, path: str) -> str:
+        return os.path.join(self._project.address, *path.split("/"))
+
+    def _list(self, path: str) -> list[str]:
+        """
+        Index the folder at `path` and get its folder names.
+        """
+        modules = []
+        folders = []
+        with self._project_lock:
+            try:
+                mtime = os.stat(self._get_real_path(path)).st_mtime_ns
+                children = self._project.get_folder(path).get_children()
+            except (OSError, ResourceNotFoundError):
+                self._discard(path)
+                return []
+
+            for child in children:
+                if child.is_folder():
+                    folders.append(child.name)
+                elif libutils.is_python_file(self._project, child):
+                    modules.append(child.name)
+        self._folders[path] = [mtime, modules, folders]
+        return folders
+
+    def _scan(self, path: str):
+        """
+        Index the folder at `path` and everything under it.
+        """
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            stack.extend(
+                f"{path}/{name}" if path else name for name in self._list(path)
+            )
+
+    def _discard(self, path: str):
+        """
+        Forget the folder at `path` and everything under it.
+        """
+        if not path:
+            self._folders.clear()
+            return
+
+        prefix = path + "/"
+        for key in [key for key in self._folders if key.startswith(prefix)]:
+            del self._folders[key]
+        self._folders.pop(path, None)
+
+    def _refresh(self, path: str):
+        """
+        List the folder at `path` again, indexing its new subfolders and forgetting
+        the removed ones.
+        """
+        old = set(self._folders[path][2]) if path in self._folders else set()
+        new = set(self._list(path))
+        for name in old - new:
+            self._discard(f"{path}/{name}" if path else name)
+        for name in new - old:
+            self._scan(f"{path}/{name}" if path else name)
+
+    def _load(self):
+        """
+        Read the persisted index and validate it, or build it from scratch.
+        """
+        if self._folders is not None:
+            return
+
+        data = self._project.data_files.read_data(self.data_name)
+        if isinstance(data, dict):
+            self._folders = data
+            self.validate()
+            logging.info("Module index loaded: %d folders.", len(self._folders))
+        else:
+            self._folders = {}
+            self._scan("")
+            logging.info("Module index built: %d folders.", len(self._folders))
+
+    def load(self):
+        """
+        Load the index, or validate it if already loaded.
+        Without it, the index is loaded on first use.
+        """
+        with self._lock:
+            if self._folders is None:
+                self._load()
+            else:
+                self.validate()
+
+    def validate(self):
+        """
+        Refresh the folders modified since they were indexed,
+        e.g. by another program or while the project was closed.
+        """
+        with self._lock:
+            if self._folders is None:
+                return
+
+            for path in sorted(self._folders):
+                folder = self._folders.get(path)
+                if folder is None:  # Discarded with its parent.
+                    continue
+                try:
+                    mtime = os.stat(self._get_real_path(path)).st_mtime_ns
+                except OSError:
+                    self._discard(path)
+                    continue
+                if mtime != folder[0]:
+                    self._refresh(path)
+
+    def refresh(self, folder: Resource):
+        """
+        Refresh an altered `folder`.
+        """
+        with self._lock:
+            if self._folders is not None:
+                self._refresh(folder.path)
+
+    def rebuild(self, folder: Resource):
+        """
+        Index `folder` and everything under it again, e.g. once its `.gitignore`
+        changed what is pruned below it.
+        """
+        with self._lock:
+            if self._folders is not None:
+                self._discard(folder.path)
+                self._scan(folder.path)
+
+    def update(self, changes: Change):
+        """
+        Refresh the folders altered by the performed `changes`.
+        """
+        with self._lock:
+            if self._folders is None:
+                return
+            for folder in get_changed_folders(changes):
+                self._refresh(folder.path)
+
+    def get_packages(self) -> list[str]:
+        """
+        Get the paths of the packages, and the project root as the last one.
+        """
+        with self._lock:
+            self._load()
+            packages = [
+                path
+                for path, (_, modules, _) in self._folders.items()
+                if path and "__init__.py" in modules
+            ]
+        packages.sort()
+        packages.append("")
+        return packages
+
+    def get_modules(self) -> list[str]:
+        """
+        Get the paths of the python modules.
+        """
+        with self._lock:
+            self._load()
+            modules = [
+                f"{path}/{name}" if path else name
+                for path, (_, names, _) in self._folders.items()
+                for name in names
+            ]
+        modules.sort()
+        return modules
+
+    def save(self):
+        """
+        Persist the index in the rope folder.
+        """
+        with self._lock:
+            if self._folders is not None:
+                self._project.data_files.write_data(self.data_name, self._folders)
+
+
+_module_indexes: "weakref.WeakKeyDictionary[Project, ModuleIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_module_index(project: Project) -> ModuleIndex:
+    """
+    Get the module index of `project`, shared by the whole application.
+    """
+    try:
+        return _module_indexes[project]
+    except KeyError:
+        index = _module_indexes[project] = ModuleIndex(project)
+        return index
@@ -14,18 +14,22 @@ Application Main Entrance.
 import logging
 import sys
 
-from PyQt6.QtWidgets import QApplication
-
-from ui.mainwindow import MainWindow
-
-# Configure the logging module
-logging.basicConfig(filename="main.log", level=logging.DEBUG)
-
 
 def main():
     """
     Application Main Entrance.
+
+    Worker processes are spawned, they import this module again as `__mp_main__`.
+    Qt and the logging configuration are only set up here, not on import.
     """
+    # pylint:disable=import-outside-toplevel
+    from PyQt6.QtWidgets import QApplication
+
+    from ui.mainwindow import MainWindow
+
+    # Configure the logging module
+    logging.basicConfig(filename="main.log", level=logging.DEBUG)
+
     app = QApplication(sys.argv)
     with MainWindow() as mainwindow:
         mainwindow.show()
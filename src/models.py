@@ -0,0 +1,420 @@
+# -------------------------------------------------------------------------------
+# Name:        models
+# Purpose:     Item models used by the views.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Item models used by the views.
+"""
+from typing import Any, Union
+
+from PyQt6.QtCore import (
+    QAbstractItemModel,
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    pyqtSlot,
+)
+from PyQt6.QtGui import QBrush, QColor, QFontDatabase
+from rope.base.change import Change, ChangeSet
+from rope.base.resources import Resource
+
+from utilities import (
+    fuzzy_filter,
+    fuzzy_rank,
+    get_changed_folders,
+    get_changes,
+    get_validate_children,
+)
+
+
+class _TreeNode:
+    """
+    A node of `ProjectModel`, wrapping a single resource.
+    The children of a folder node are listed only when `fetched` is set.
+    """
+
+    __slots__ = ("resource", "parent", "row", "children", "fetched")
+
+    def __init__(self, resource: Resource, parent: Union[None, "_TreeNode"], row: int):
+        self.resource = resource
+        self.parent = parent
+        self.row = row
+        self.children: list["_TreeNode"] = []
+        self.fetched = not resource.is_folder()
+
+
+class ProjectModel(QAbstractItemModel):
+    """
+    Lazy tree model of a project.
+    Children of a folder are listed when the view expands it or when a background
+    scan delivers them (see `populate`), so the GUI thread never walks the whole project.
+    """
+
+    def __init__(self, root_resource: Resource, parent: Union[None, QObject] = None):
+        super().__init__(parent)
+        self._root = _TreeNode(root_resource, None, 0)
+        # Loaded nodes by resource path.
+        self._nodes = {root_resource.path: self._root}
+
+    def _node(self, index: QModelIndex) -> _TreeNode:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def _index(self, node: _TreeNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _add_nodes(self, node: _TreeNode, children: list[Resource]):
+        first = len(node.children)
+        for row, child in enumerate(children, start=first):
+            child_node = _TreeNode(child, node, row)
+            node.children.append(child_node)
+            self._nodes[child.path] = child_node
+
+    def _discard_nodes(self, node: _TreeNode):
+        del self._nodes[node.resource.path]
+        for child in node.children:
+            self._discard_nodes(child)
+
+    def update(self, changes: Change):
+        """
+        Update the nodes touched by the performed `changes`,
+        keeping the rest of the tree (and its expanded state) untouched.
+        """
+        for folder in get_changed_folders(changes):
+            self.refresh(folder)
+
+    def populate(self, listings: list[tuple[Resource, list[Resource]]]):
+        """
+        Fill in folders with children listed in the background.
+        Folders that are already listed, or whose node is not loaded yet, are skipped.
+        """
+        for folder, children in listings:
+            node = self._nodes.get(folder.path)
+            if node is not None and not node.fetched:
+                self._set_children(node, children)
+
+    def refresh(self, folder: Resource):
+        """
+        Synchronize the children of `folder` with the file system.
+        Nothing is done if `folder` has not been listed yet.
+        """
+        node = self._nodes.get(folder.path)
+        if node is None or not node.fetched:
+            return
+
+        parent = self._index(node)
+        had_children = bool(node.children)
+        children = {child.name: child for child in get_validate_children(folder)}
+
+        for row in reversed(range(len(node.children))):
+            if node.children[row].resource.name in children:
+                continue
+            self.beginRemoveRows(parent, row, row)
+            self._discard_nodes(node.children.pop(row))
+            for child in node.children[row:]:
+                child.row -= 1
+            self.endRemoveRows()
+
+        known = {child.resource.name for child in node.children}
+        created = [child for name, child in children.items() if name not in known]
+        if created:
+            first = len(node.children)
+            self.beginInsertRows(parent, first, first + len(created) - 1)
+            self._add_nodes(node, created)
+            self.endInsertRows()
+
+        if parent.isValid() and had_children != bool(node.children):
+            self.dataChanged.emit(parent, parent)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()):
+        node = self._node(parent)
+        if column != 0 or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()):  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+
+        parent = index.internalPointer().parent
+        if parent is None:
+            return QModelIndex()
+        return self._index(parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if not node.fetched:
+            return True
+        return bool(node.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not self._node(parent).fetched
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._node(parent)
+        if not node.fetched:
+            self._set_children(node, get_validate_children(node.resource))
+
+    def _set_children(self, node: _TreeNode, children: list[Resource]):
+        node.fetched = True
+        parent = self._index(node)
+
+        if not children:
+            # The expand indicator disappears once the folder is known to be empty.
+            if parent.isValid():
+                self.dataChanged.emit(parent, parent)
+            return
+
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        self._add_nodes(node, children)
+        self.endInsertRows()
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        resource = index.internalPointer().resource
+        if role == Qt.ItemDataRole.DisplayRole:
+            return resource.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return resource.path
+        return None
+
+
+class FuzzyListModel(QAbstractListModel):
+    """
+    List of the items matching a fuzzy pattern, best first.
+
+    Only the `limit` best matches are listed, so that typing stays responsive with
+    tens of thousands of items. When the pattern is extended, only the previous
+    matches are searched again.
+    """
+
+    limit = 200
+
+    def __init__(self, items: list[str], parent: Union[None, QObject] = None):
+        super().__init__(parent)
+        self._items = items
+        self._text = ""
+        self._matches = items
+        self._rows = items[: self.limit]
+
+    @property
+    def match_count(self) -> int:
+        return len(self._matches)
+
+    @property
+    def item_count(self) -> int:
+        return len(self._items)
+
+    def set_pattern(self, text: str):
+        """
+        List the best items matching `text`.
+        """
+        if text == self._text:
+            return
+
+        if not text:
+            matches = self._items
+            rows = matches[: self.limit]
+        else:
+            candidates = self._items
+            if self._text and text.lower().startswith(self._text.lower()):
+                candidates = self._matches
+            matches = fuzzy_filter(text, candidates)
+            rows = fuzzy_rank(text, matches, self.limit)
+
+        self.beginResetModel()
+        self._text = text
+        self._matches = matches
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        item = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item or "<project root>"
+        if role in (Qt.ItemDataRole.ToolTipRole, Qt.ItemDataRole.UserRole):
+            return item
+        return None
+
+
+class _ChangeNode:
+    """
+    A file level change of `ChangesModel`.
+    The lines of its description are computed only while it is expanded.
+    """
+
+    __slots__ = ("change", "row", "lines")
+
+    def __init__(self, change: Change, row: int):
+        self.change = change
+        self.row = row
+        self.lines: Union[None, list[str]] = None
+
+
+class ChangesModel(QAbstractItemModel):
+    """
+    Lazy tree model of a change set.
+
+    The changed files are listed first. The description of a change, e.g. its
+    unified diff, is computed when the file is expanded (see `fetchMore`), and
+    dropped when it is collapsed (see `release`), so the memory and the rendering
+    time do not grow with the size of the change set.
+    """
+
+    # Colors of the diff lines by prefix.
+    _line_colors = {
+        "+": QColor("darkgreen"),
+        "-": QColor("darkred"),
+        "@": QColor("darkblue"),
+    }
+
+    def __init__(self, changes: ChangeSet, parent: Union[None, QObject] = None):
+        super().__init__(parent)
+        self._description = str(changes)
+        self._nodes = [
+            _ChangeNode(change, row) for row, change in enumerate(get_changes(changes))
+        ]
+        # Parent of the top level indexes.
+        self._root = object()
+        self._font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+
+    @pyqtSlot(QModelIndex)
+    def release(self, index: QModelIndex):
+        """
+        Drop the description lines of the file at `index`, e.g. once collapsed.
+        """
+        if not index.isValid() or index.internalPointer() is not self._root:
+            return
+
+        node = self._nodes[index.row()]
+        if not node.lines:
+            node.lines = None
+            return
+
+        self.beginRemoveRows(index, 0, len(node.lines) - 1)
+        node.lines = None
+        self.endRemoveRows()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()):
+        if column != 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if 0 <= row < len(self._nodes):
+                return self.createIndex(row, column, self._root)
+            return QModelIndex()
+
+        node = self._nodes[parent.row()]
+        if parent.internalPointer() is self._root and 0 <= row < len(node.lines or ()):
+            return self.createIndex(row, column, node)
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()):  # type: ignore[override]
+        if not index.isValid() or index.internalPointer() is self._root:
+            return QModelIndex()
+        return self.createIndex(index.internalPointer().row, 0, self._root)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return len(self._nodes)
+        if parent.internalPointer() is self._root:
+            return len(self._nodes[parent.row()].lines or ())
+        return 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self._nodes)
+        return parent.internalPointer() is self._root
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if not parent.isValid() or parent.internalPointer() is not self._root:
+            return False
+        return self._nodes[parent.row()].lines is None
+
+    def fetchMore(self, parent: QModelIndex):
+        if not self.canFetchMore(parent):
+            return
+
+        node = self._nodes[parent.row()]
+        lines = node.change.get_description().splitlines()
+        if not lines:
+            node.lines = []
+            return
+
+        self.beginInsertRows(parent, 0, len(lines) - 1)
+        node.lines = lines
+        self.endInsertRows()
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        horizontal = orientation == Qt.Orientation.Horizontal
+        if horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return f"{self._description} ({len(self._nodes)} changes)"
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        pointer = index.internalPointer()
+        if pointer is self._root:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return str(self._nodes[index.row()].change)
+            return None
+
+        line = pointer.lines[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return line
+        if role == Qt.ItemDataRole.FontRole:
+            return self._font
+        if role == Qt.ItemDataRole.ForegroundRole:
+            color = self._line_colors.get(line[:1])
+            if color is not None and not line.startswith(("+++", "---")):
+                return QBrush(color)
+        return None
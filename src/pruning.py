@@ -0,0 +1,234 @@
+# -------------------------------------------------------------------------------
+# Name:        pruning
+# Purpose:     Prune ignored resources from the project.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Prune ignored resources from the project.
+
+Rope lists the children of a folder through `Project.is_ignored`, so replacing the
+matcher behind it prunes the ignored subtrees from the project tree, the project scan
+and `Project.get_python_files` alike. A resource is pruned if it matches:
+
+- rope's `ignored_resources` preference.
+- A `.gitignore` file of the project, in the folder of the resource or above.
+- The `pruned_resources` preference, a list of patterns in `.gitignore` syntax.
+  Rope drops unknown preferences set by `set_prefs`, so it is set by the
+  `project_opened` function of `.ropeproject/config.py`.
+"""
+import os
+import re
+import weakref
+from typing import Iterable, NamedTuple, Union
+
+from rope.base.project import Project
+from rope.base.resources import Resource
+
+from utilities import get_modification_times, get_project_lock
+
+# Used when the `pruned_resources` preference is not set.
+DEFAULT_PRUNED_RESOURCES = ["node_modules/", "__pycache__/", "*.egg-info/"]
+
+
+class Rule(NamedTuple):
+    """
+    A pattern of a `.gitignore` file.
+    """
+
+    regex: re.Pattern
+    negated: bool
+    folder_only: bool
+
+
+def _translate(pattern: str) -> str:
+    result = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("/**", index) and index + 3 == len(pattern):
+            result.append("(?:/.*)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            result.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            result.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            result.append("[^/]")
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 2 :]:
+            end = pattern.index("]", index + 2)
+            result.append("[" + pattern[index + 1 : end].replace("!", "^", 1) + "]")
+            index = end + 1
+        else:
+            result.append(re.escape(pattern[index]))
+            index += 1
+    return "".join(result)
+
+
+def parse_rules(lines: Iterable[str]) -> list[Rule]:
+    """
+    Parse the lines of a `.gitignore` file.
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated or line.startswith("\\"):
+            line = line[1:]
+
+        folder_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        # Patterns with a slash are relative to the `.gitignore` file.
+        if "/" in line:
+            regex = "^" + _translate(line.lstrip("/")) + "$"
+        else:
+            regex = "^(?:.*/)?" + _translate(line) + "$"
+        rules.append(Rule(re.compile(regex), negated, folder_only))
+    return rules
+
+
+class ResourcePruner:
+    """
+    Matcher of the resources to prune, replacing `Project.ignored`,
+    see `get_pruner`.
+
+    The `.gitignore` files are read once, holding the project lock,
+    see `get_project_lock`, and again once modified, see `refresh`.
+    """
+
+    def __init__(self, project: Project):
+        # Shared through `get_pruner`, which must not keep the project alive.
+        self._project = weakref.proxy(project)
+        self._lock = get_project_lock(project)
+        self._ignored = project.ignored
+        self._rules = parse_rules(
+            project.prefs.get("pruned_resources", DEFAULT_PRUNED_RESOURCES)
+        )
+        # Modification time and rules of the `.gitignore` file in each folder,
+        # by folder path.
+        self._gitignores: dict[str, tuple[Union[None, int], list[Rule]]] = {}
+
+    def set_patterns(self, patterns: list[str]):
+        """
+        Set rope's `ignored_resources` patterns.
+        """
+        self._ignored.set_patterns(patterns)
+
+    def _get_gitignore_path(self, folder: str) -> str:
+        return os.path.join(self._project.address, *folder.split("/"), ".gitignore")
+
+    def refresh(self) -> list[str]:
+        """
+        Forget the `.gitignore` files created, removed or modified since they were
+        read, so they are read again.
+        Returns the paths of their folders, in which resources may now be pruned
+        or not.
+        """
+        with self._lock:
+            paths = {
+                self._get_gitignore_path(folder): folder for folder in self._gitignores
+            }
+            times = get_modification_times(paths)
+            folders = [
+                folder
+                for path, folder in paths.items()
+                if times[path] != self._gitignores[folder][0]
+            ]
+            for folder in folders:
+                del self._gitignores[folder]
+        return sorted(folders)
+
+    def _get_gitignore(self, folder: str) -> list[Rule]:
+        with self._lock:
+            try:
+                return self._gitignores[folder][1]
+            except KeyError:
+                pass
+
+            path = self._get_gitignore_path(folder)
+            # Before reading, so a file modified meanwhile is read again.
+            mtime = get_modification_times([path])[path]
+            try:
+                with open(path, encoding="utf-8", errors="replace") as file:
+                    rules = parse_rules(file)
+            except OSError:
+                rules = []
+            self._gitignores[folder] = (mtime, rules)
+            return rules
+
+    def does_match(self, resource: Resource) -> bool:
+        if self._ignored.does_match(resource):
+            return True
+
+        path = resource.path
+        is_folder = resource.is_folder()
+        pruned = _match(self._rules, path, is_folder, False)
+
+        folder = ""
+        names = path.split("/")
+        for depth in range(len(names)):
+            rules = self._get_gitignore(folder)
+            if rules:
+                relative = "/".join(names[depth:])
+                pruned = _match(rules, relative, is_folder, pruned)
+            folder = "/".join(names[: depth + 1])
+        return pruned
+
+
+def _match(rules: list[Rule], path: str, is_folder: bool, pruned: bool) -> bool:
+    """
+    Apply `rules` to `path`, the last matching rule wins.
+    """
+    for rule in rules:
+        if rule.folder_only and not is_folder:
+            continue
+        if rule.regex.match(path):
+            pruned = not rule.negated
+    return pruned
+
+
+_pruners: "weakref.WeakKeyDictionary[Project, ResourcePruner]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def install_pruner(project: Project) -> ResourcePruner:
+    """
+    Make `project` prune the ignored resources.
+    """
+    pruner = _pruners[project] = ResourcePruner(project)
+    project.ignored = pruner
+    project.prefs.add_callback("ignored_resources", pruner.set_patterns)
+    return pruner
+
+
+def get_pruner(project: Project) -> ResourcePruner:
+    """
+    Get the pruner installed in `project` by `install_pruner`.
+    """
+    return _pruners[project]
+
+
+def open_project(path: str, **prefs) -> Project:
+    """
+    Open the rope project at `path`, pruning the ignored resources.
+    `prefs` override the preferences of the project configuration, like `Project`.
+    """
+    project = Project(path, **prefs)
+    install_pruner(project)
+    return project
@@ -0,0 +1,436 @@
+# -------------------------------------------------------------------------------
+# Name:        refactorings
+# Purpose:     Refactoring engines built on top of rope.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Refactoring engines built on top of rope.
+This module does not depend on Qt.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, as_completed
+from typing import NamedTuple, Union
+
+from rope.base import libutils, pyobjects
+from rope.base.change import ChangeContents, ChangeSet, create_job_set
+from rope.base.codeanalyze import ChangeCollector
+from rope.base.project import Project
+from rope.base.pynames import PyName
+from rope.base.resources import File, Resource
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
+from rope.refactor import occurrences
+from rope.refactor.move import MoveGlobal, MoveMethod, MoveModule
+from rope.refactor.rename import Rename, _is_local
+
+from pruning import open_project
+from summaries import get_module_summaries
+from utilities import get_changes, get_modification_times, get_process_pool
+
+
+class Occurrences(NamedTuple):
+    """
+    The occurrences of a name in a module.
+    """
+
+    resource: File
+    source: str
+    ranges: list[tuple[int, int]]
+
+
+class OccurrenceRename:
+    """
+    Rename whose occurrences are searched once, then substituted for each new name.
+    Previewing or performing a rename with another name costs O(occurrences), not O(project).
+
+    The search is thread safe, so it can be started in the background
+    while the changes are requested from another thread.
+
+    With `processes` above 1, the modules are split into partitions searched by
+    that many worker processes, see `find_occurrence_ranges`.
+
+    Like `Rename.get_changes`, the search can be restricted to some `resources`,
+    see `get_scope_resources`. Outside strings and comments, a module or a global
+    is only searched in the modules depending on it, see `get_dependent_resources`.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        resource: Resource,
+        offset: Union[None, int],
+        processes: int = 0,
+    ):
+        self._rename = Rename(project, resource, offset)
+        self._module = get_global_module(self._rename.old_pyname, self.old_name)
+        self._offset = offset
+        self.processes = processes
+        self._lock = threading.Lock()
+        # Occurrences and the modification times of the modules they depend on,
+        # see `_get_dependencies`, by `docs` flag and searched modules.
+        self._found: dict[tuple, tuple[list[Occurrences], dict]] = {}
+
+    @property
+    def old_name(self) -> str:
+        return self._rename.get_old_name()
+
+    def _get_resources(self, resources: Union[None, list[File]]) -> list[File]:
+        rename = self._rename
+        if _is_local(rename.old_pyname):
+            return [rename.resource]
+        if resources is None:
+            return rename.project.get_python_files()
+        return resources
+
+    def _get_dependencies(self) -> list[str]:
+        """
+        Get the real paths of the modules the occurrences depend on. Besides those
+        containing one, any module may start using the old name, or importing the
+        module defining it.
+        """
+        rename = self._rename
+        if _is_local(rename.old_pyname):
+            return [rename.resource.real_path]
+        return [resource.real_path for resource in rename.project.get_python_files()]
+
+    def get_affected_resources(
+        self, docs: bool = False, resources: Union[None, list[File]] = None
+    ) -> list[File]:
+        """
+        Get the modules of `resources`, or of the whole project, the old name may be
+        renamed in, honoring `docs` like `Rename.get_changes`. None is parsed.
+        """
+        rename = self._rename
+        resources = self._get_resources(resources)
+        # Names in strings and comments do not need an import.
+        if not docs and self._module is not None:
+            resources = get_dependent_resources(
+                rename.project, self._module, resources
+            )
+        # The modules the old name does not occur in are not even parsed.
+        return get_module_summaries(rename.project).filter(resources, rename.old_name)
+
+    def _search(
+        self, resources: list[File], docs: bool, task_handle: BaseTaskHandle
+    ) -> list[Occurrences]:
+        rename = self._rename
+        finder = occurrences.create_finder(
+            rename.project,
+            rename.old_name,
+            rename.old_pyname,
+            docs=docs,
+            instance=rename.old_instance,
+        )
+        found = []
+
+        job_set = task_handle.create_jobset("Finding Occurrences", len(resources))
+        for resource in resources:
+            job_set.started_job(resource.path)
+            ranges = [
+                occurrence.get_word_range()
+                for occurrence in finder.find_occurrences(resource)
+            ]
+            if ranges:
+                found.append(Occurrences(resource, resource.read(), ranges))
+            job_set.finished_job()
+        return found
+
+    def _search_in_parallel(
+        self, resources: list[File], docs: bool, task_handle: BaseTaskHandle
+    ) -> list[Occurrences]:
+        """
+        Search the partitions of `resources` in worker processes, and merge their
+        occurrences in the order of `resources`.
+        """
+        rename = self._rename
+        project = rename.project
+        # Deal the modules from the largest, so the partitions weigh about the same.
+        # More partitions than processes keep them all busy until the end.
+        by_size = sorted(
+            resources,
+            key=lambda resource: os.path.getsize(resource.real_path),
+            reverse=True,
+        )
+        count = min(self.processes * 4, len(by_size))
+        partitions = [by_size[index::count] for index in range(count)]
+
+        pool = get_process_pool(self.processes)
+        futures: dict[Future, list[File]] = {
+            pool.submit(
+                find_occurrence_ranges,
+                project.address,
+                rename.resource.path,
+                self._offset,
+                docs,
+                [resource.path for resource in partition],
+            ): partition
+            for partition in partitions
+        }
+
+        found = {}
+        job_set = task_handle.create_jobset("Finding Occurrences", len(resources))
+        try:
+            for future in as_completed(futures):
+                job_set.started_job(f"{len(futures[future])} modules")
+                for path, ranges in future.result():
+                    resource = project.get_resource(path)
+                    found[path] = Occurrences(resource, resource.read(), ranges)
+                for _ in futures[future]:
+                    job_set.finished_job()
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return [
+            found[resource.path] for resource in resources if resource.path in found
+        ]
+
+    def find_occurrences(
+        self,
+        docs: bool = False,
+        resources: Union[None, list[File]] = None,
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> list[Occurrences]:
+        """
+        Find the occurrences of the old name in `resources`, or in the whole project,
+        honoring `docs` like `Rename.get_changes`.
+        The result is reused until a module is created, removed or modified.
+        """
+        with self._lock:
+            key = (
+                docs,
+                None if resources is None else frozenset(r.path for r in resources),
+            )
+            times = get_modification_times(self._get_dependencies())
+            if key in self._found:
+                found, found_times = self._found[key]
+                if found_times == times:
+                    return found
+
+            rename = self._rename
+            resources = self.get_affected_resources(docs, resources)
+            if self.processes > 1 and len(resources) > 1:
+                found = self._search_in_parallel(resources, docs, task_handle)
+            else:
+                found = self._search(resources, docs, task_handle)
+
+            self._found[key] = (found, times)
+            logging.info(
+                "Found %d occurrences of <%s> in %d modules.",
+                sum(len(occurrence.ranges) for occurrence in found),
+                rename.old_name,
+                len(found),
+            )
+            return found
+
+    def get_changes(
+        self,
+        new_name: str,
+        docs: bool = False,
+        resources: Union[None, list[File]] = None,
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> ChangeSet:
+        """
+        Get the changes of renaming to `new_name` in `resources`, or in the whole
+        project, like `Rename.get_changes`.
+        """
+        rename = self._rename
+        rename.validate_changes(new_name)
+
+        changes = ChangeSet(f"Renaming <{rename.old_name}> to <{new_name}>")
+        for occurrence in self.find_occurrences(docs, resources, task_handle):
+            collector = ChangeCollector(occurrence.source)
+            for start, end in occurrence.ranges:
+                collector.add_change(start, end, new_name)
+
+            new_contents = collector.get_changed()
+            if new_contents is not None:
+                changes.add_change(ChangeContents(occurrence.resource, new_contents))
+
+        # pylint:disable=protected-access
+        if isinstance(rename.old_pyname.get_object(), pyobjects.AbstractModule):
+            resource = rename.old_pyname.get_object().get_resource()
+            if rename._is_allowed_to_move(self._get_resources(resources), resource):
+                rename._rename_module(resource, new_name, changes)
+        return changes
+
+
+# Projects opened in a worker process, by root folder.
+_worker_projects: dict[str, Project] = {}
+
+
+def find_occurrence_ranges(
+    root: str, path: str, offset: Union[None, int], docs: bool, paths: list[str]
+) -> list[tuple[str, list[tuple[int, int]]]]:
+    """
+    Find, in the modules at `paths`, the occurrences of the name renamed by
+    `Rename(project, path, offset)` in the project at `root`.
+    Returns the word ranges of the occurrences by module path.
+
+    This runs in a worker process, which keeps the project open for the next
+    partitions, so the modules are only parsed again once they are modified.
+    """
+    project = _worker_projects.get(root)
+    if project is None:
+        project = _worker_projects[root] = open_project(root)
+    else:
+        project.validate()
+
+    rename = Rename(project, project.get_resource(path), offset)
+    finder = occurrences.create_finder(
+        project,
+        rename.old_name,
+        rename.old_pyname,
+        docs=docs,
+        instance=rename.old_instance,
+    )
+    found = []
+    for module_path in paths:
+        ranges = [
+            occurrence.get_word_range()
+            for occurrence in finder.find_occurrences(project.get_resource(module_path))
+        ]
+        if ranges:
+            found.append((module_path, ranges))
+    return found
+
+
+def get_scope_resources(scope: list[Resource]) -> list[File]:
+    """
+    Get the python modules of `scope`, a list of modules and folders
+    whose subtrees are walked. Ignored resources are left out.
+    """
+    modules = {}
+    resources = list(scope)
+    while resources:
+        resource = resources.pop()
+        if resource.is_folder():
+            resources.extend(resource.get_children())
+        elif libutils.is_python_file(resource.project, resource):
+            modules[resource.path] = resource
+    return [modules[path] for path in sorted(modules)]
+
+
+def get_global_module(pyname: PyName, name: str) -> Union[None, Resource]:
+    """
+    Get the module or package `pyname` is, or the module `pyname` is a global
+    `name` of. `None` if it may be referenced without importing a module,
+    like attributes, parameters or builtins.
+    """
+    pyobject = pyname.get_object()
+    if isinstance(pyobject, pyobjects.AbstractModule):
+        return pyobject.get_resource()
+
+    pymodule, _ = pyname.get_definition_location()
+    if pymodule is None:
+        return None
+    global_pyname = pymodule.get_scope().get_names().get(name)
+    if occurrences.same_pyname(pyname, global_pyname):
+        return pymodule.get_resource()
+    return None
+
+
+def get_dependent_resources(
+    project: Project, module: Resource, resources: list[File]
+) -> list[File]:
+    """
+    Get the modules of `resources` that may reference `module`, a module or package:
+    those of `module` and those importing it, directly or by re-export,
+    see `ModuleSummaries.get_importers`.
+    """
+    importers = get_module_summaries(project).get_importers(
+        [module], project.get_python_files()
+    )
+    prefix = f"{module.path}/"
+    return [
+        resource
+        for resource in resources
+        if resource.path in importers
+        or resource == module
+        or resource.path.startswith(prefix)
+    ]
+
+
+def get_move_resources(
+    move: Union[MoveGlobal, MoveModule, MoveMethod],
+    destination: Union[None, str, Resource],
+    resources: Union[None, list[File]] = None,
+) -> list[File]:
+    """
+    Get the modules of `resources`, or of the whole project, that `move` may change:
+    those the moved name occurs in, and the source and destination modules.
+    Globals and modules are only looked for in the modules depending on them,
+    methods may be called from anywhere. None is parsed.
+    """
+    project = move.project
+    if resources is None:
+        resources = project.get_python_files()
+
+    searched = resources
+    if isinstance(move, MoveMethod):
+        name = move.method_name
+        required = {move.pyfunction.get_module().get_resource()}
+    else:
+        name = move.old_name
+        required = {move.source}
+        searched = get_dependent_resources(project, move.source, resources)
+    if isinstance(destination, Resource):
+        if destination.is_folder() and destination.has_child("__init__.py"):
+            destination = destination.get_child("__init__.py")
+        required.add(destination)
+
+    candidates = set(get_module_summaries(project).filter(searched, name))
+    return [
+        resource
+        for resource in resources
+        if resource in candidates or resource in required
+    ]
+
+
+def get_move_destination(
+    project: Project, move: Union[MoveGlobal, MoveModule, MoveMethod], text: str
+) -> Union[str, Resource]:
+    """
+    Interpret `text` as the destination of `move`:
+    a module or package path for global and module moves, an attribute name otherwise.
+    """
+    if isinstance(move, (MoveGlobal, MoveModule)):
+        return project.get_resource(text)
+
+    return text
+
+
+def perform_changes(
+    changes: ChangeSet, task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE
+) -> ChangeSet:
+    """
+    Perform `changes`, reporting each changed resource to `task_handle`.
+    If it is stopped, or a change fails, the changes already performed are undone
+    before raising.
+
+    `ChangeSet.do` is not used because it does not undo the change during which
+    the task is stopped.
+    """
+    job_set = create_job_set(task_handle, changes)
+    done = []
+    try:
+        for change in get_changes(changes):
+            job_set.started_job(str(change))
+            change.do()
+            done.append(change)
+            job_set.finished_job()
+        job_set.check_status()
+    except Exception:
+        for change in reversed(done):
+            change.undo()
+        raise
+
+    changes.time = time.time()
+    return changes
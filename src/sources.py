@@ -0,0 +1,201 @@
+# -------------------------------------------------------------------------------
+# Name:        sources
+# Purpose:     Read the source code of modules for display.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Read the source code of modules for display.
+"""
+import bisect
+import codecs
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import OrderedDict
+
+from rope.base.change import Change
+from rope.base.fscommands import read_str_coding
+from rope.base.resources import Resource
+
+# Bytes that do not start a character once decoded the way rope does:
+# UTF-8 continuation bytes, and the carriage return of `\r\n`.
+_HIDDEN_BYTES = re.compile(rb"[\x80-\xbf]|\r(?=\n)")
+# Bytes decoded at a time when validating a module.
+_CHUNK_SIZE = 1 << 20
+
+
+class SourceDocument:
+    """
+    A memory-mapped UTF-8 module, indexed by line so that any range of lines can be
+    decoded without reading the whole file.
+
+    Offsets are counted in characters of the text returned by `Resource.read`,
+    where `\\r\\n` is a single `\\n`, so they can be passed to rope.
+
+    Reading a page of a file truncated since it was mapped crashes the process,
+    so the document must be mapped again once `is_modified`.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self._stat = (stat.st_mtime_ns, stat.st_size)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._index()
+        except Exception:
+            self._map.close()
+            raise
+
+    @staticmethod
+    def is_supported(path: str) -> bool:
+        """
+        Verify if the module at `path` can be indexed: it is valid UTF-8, or ASCII
+        if declared so, and does not use `\\r` alone as line separator.
+        Otherwise rope decodes it as latin-1 or splits its lines differently.
+        """
+        with open(path, "rb") as file:
+            encoding = read_str_coding(file.read(1 << 16)) or "utf-8"
+            if encoding.lower().replace("_", "-") not in ("utf-8", "utf8", "ascii"):
+                return False
+            if os.fstat(file.fileno()).st_size == 0:
+                return True
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if re.search(rb"\r(?!\n)", data) is not None:
+                    return False
+                decoder = codecs.getincrementaldecoder(encoding)()
+                try:
+                    for start in range(0, len(data), _CHUNK_SIZE):
+                        decoder.decode(data[start : start + _CHUNK_SIZE])
+                    decoder.decode(b"", final=True)
+                except UnicodeDecodeError:
+                    return False
+        return True
+
+    def _index(self):
+        # Byte and character offsets of the start of each line.
+        self._line_bytes = array("q", [0])
+        self._line_chars = array("q", [0])
+
+        hidden = array("q", (match.start() for match in _HIDDEN_BYTES.finditer(self._map)))
+        for match in re.finditer(rb"\n", self._map):
+            start = match.end()
+            self._line_bytes.append(start)
+            self._line_chars.append(start - bisect.bisect_left(hidden, start))
+
+        size = len(self._map)
+        self._size_chars = size - len(hidden)
+        # A trailing newline does not start a line.
+        if len(self._line_bytes) > 1 and self._line_bytes[-1] == size:
+            self._line_bytes.pop()
+            self._line_chars.pop()
+
+    def is_modified(self) -> bool:
+        """
+        Verify if the file was modified, resized or removed since it was mapped.
+        """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return True
+        return (stat.st_mtime_ns, stat.st_size) != self._stat
+
+    @property
+    def line_count(self) -> int:
+        return len(self._line_bytes)
+
+    @property
+    def size(self) -> int:
+        """
+        Size in bytes.
+        """
+        return len(self._map)
+
+    def get_lines(self, first: int, last: int) -> str:
+        """
+        Decode the lines from `first` to `last` excluded, like rope does.
+        """
+        first = max(first, 0)
+        start = self._line_bytes[first]
+        end = self._line_bytes[last] if last < self.line_count else len(self._map)
+        text = self._map[start:end].decode("utf-8", errors="replace")
+        return text.replace("\r\n", "\n")
+
+    def get_offset(self, line: int) -> int:
+        """
+        Get the character offset of the start of `line`.
+        """
+        if line >= self.line_count:
+            return self._size_chars
+        return self._line_chars[line]
+
+    def get_line(self, offset: int) -> int:
+        """
+        Get the line containing the character `offset`.
+        """
+        return max(bisect.bisect_right(self._line_chars, offset) - 1, 0)
+
+    def close(self):
+        self._map.close()
+
+
+class SourceCache:
+    """
+    Least recently used cache of decoded module sources, within `budget` bytes.
+
+    Entries are keyed by modification time and size, so a module modified on disk
+    is read again. Entries of modules touched by rope changes are dropped at once.
+    """
+
+    def __init__(self, budget: int = 64 << 20):
+        self.budget = budget
+        self._size = 0
+        # (modification time, size, text, bytes used) by real path.
+        self._entries: "OrderedDict[str, tuple[int, int, str, int]]" = OrderedDict()
+
+    def read(self, resource: Resource) -> str:
+        """
+        Get the source of `resource`, as `Resource.read` does.
+        """
+        path = resource.real_path
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._entries.move_to_end(path)
+            return entry[2]
+
+        self._discard(path)
+        text = resource.read()
+        used = sys.getsizeof(text)
+        if used <= self.budget:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, text, used)
+            self._size += used
+            while self._size > self.budget:
+                self._discard(next(iter(self._entries)))
+        return text
+
+    def _discard(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._size -= entry[3]
+
+    def update(self, changes: Change):
+        """
+        Drop the modules touched by the performed `changes`.
+        """
+        for resource in changes.get_changed_resources():
+            self._discard(resource.real_path)
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
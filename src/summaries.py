@@ -0,0 +1,410 @@
+# -------------------------------------------------------------------------------
+# Name:        summaries
+# Purpose:     Summaries of the project modules, built in worker processes.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Summaries of the project modules, built in worker processes.
+"""
+import ast
+import logging
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import as_completed
+from typing import Iterable
+
+from rope.base import fscommands
+from rope.base.project import Project
+from rope.base.resources import File, Resource
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
+
+from utilities import get_process_pool, get_project_lock
+
+# A name only occurs in a module as a whole word, in code, strings or comments.
+_IDENTIFIER = re.compile(r"\b[^\W\d]\w*")
+
+# Summary of a module: (modification time, size, identifiers of the source, imports).
+_Summary = tuple
+
+# The imports of a module, see `_get_imports`, are dotted module names: `a.b` for the
+# namespace of `a.b` only, `a.b.*` for `a.b` and every module below it.
+# Those of a module that does not parse are unknown, it may import anything.
+_UNKNOWN_IMPORTS = ""
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE identifiers (
+    identifier TEXT NOT NULL,
+    file INTEGER NOT NULL,
+    PRIMARY KEY (identifier, file)
+) WITHOUT ROWID;
+CREATE INDEX identifiers_file ON identifiers (file);
+CREATE TABLE imports (
+    module TEXT NOT NULL,
+    file INTEGER NOT NULL,
+    PRIMARY KEY (module, file)
+) WITHOUT ROWID;
+CREATE INDEX imports_file ON imports (file);
+"""
+# Bumped when `_SCHEMA`, `_IDENTIFIER` or `_get_imports` change,
+# the index is then built again.
+_SCHEMA_VERSION = 3
+
+
+def _get_module_name(path: str) -> str:
+    """
+    Get the dotted name of the module or package at project `path`, from the root.
+    """
+    names = path.split("/")
+    names[-1] = os.path.splitext(names[-1])[0]
+    if names[-1] == "__init__":
+        names.pop()
+    return ".".join(names)
+
+
+def _get_imports(text: str, path: str) -> frozenset[str]:
+    """
+    Get the modules the source `text` of the module at project `path` imports,
+    relative imports being resolved from the root.
+    """
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return frozenset([_UNKNOWN_IMPORTS])
+
+    package = _get_module_name(path).split(".")
+    if not path.endswith("/__init__.py") and path != "__init__.py":
+        package.pop()
+
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                # `import a.b` binds `a`, every module below it is then reachable.
+                name = alias.name if alias.asname else alias.name.partition(".")[0]
+                imports.add(f"{name}.*")
+        elif isinstance(node, ast.ImportFrom):
+            names = [node.module] if node.module else []
+            if node.level:
+                if node.level - 1 > len(package):
+                    continue
+                names = package[: len(package) - node.level + 1] + names
+            module = ".".join(names)
+            if module:
+                imports.add(module)
+            # The imported names may be modules, those below them are then reachable.
+            for alias in node.names:
+                if alias.name != "*":
+                    imports.add(f"{module}.{alias.name}.*".lstrip("."))
+                # A star import may bind any module below, e.g. through `__all__`.
+                elif module:
+                    imports.add(f"{module}.*")
+                else:
+                    imports.add(_UNKNOWN_IMPORTS)
+    return frozenset(imports)
+
+
+def _get_import_patterns(path: str) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Get the imports of the modules that may reference the module or package
+    at project `path`: names and ranges of names.
+
+    The module is matched under every dotted name it may be imported by,
+    from the root or from any folder below, such as a source folder.
+    """
+    names = _get_module_name(path).split(".")
+    exact = {_UNKNOWN_IMPORTS}
+    ranges = []
+    for start in range(len(names)):
+        for end in range(start + 1, len(names) + 1):
+            exact.add(".".join(names[start:end]) + ".*")
+        name = ".".join(names[start:])
+        exact.add(name)
+        # Any import of a module below it, `.` is followed by `/` in code point order.
+        ranges.append((f"{name}.", f"{name}/"))
+    return sorted(exact), ranges
+
+
+def summarize_modules(paths: list[tuple[str, str]]) -> list[tuple[str, _Summary]]:
+    """
+    Summarize the modules at `paths`, pairs of project path and real path.
+    The source is decoded like rope does. Unreadable modules are left out.
+
+    This runs in a worker process, or in a background thread.
+    """
+    summaries = []
+    for path, real_path in paths:
+        try:
+            # Before reading, so a module modified meanwhile is summarized again.
+            stat = os.stat(real_path)
+            with open(real_path, "rb") as file:
+                text, _ = fscommands.file_data_to_unicode(file.read())
+        except (OSError, UnicodeDecodeError, LookupError):
+            continue
+        identifiers = frozenset(_IDENTIFIER.findall(text))
+        imports = _get_imports(text, path)
+        summaries.append((path, (stat.st_mtime_ns, stat.st_size, identifiers, imports)))
+    return summaries
+
+
+class ModuleSummaries:
+    """
+    Inverted index from the identifiers of the project modules to the modules
+    containing them, so that refactorings skip the modules a name does not
+    occur in without rope parsing them.
+    The modules they import are indexed too, so that the modules depending on one
+    are found without rope analyzing them, see `get_importers`.
+
+    The index is an SQLite database in the rope folder, so it survives restarts.
+    Each module is recorded with its modification time and size, and summarized
+    again once they change.
+    It is built in the background when the project is opened, by
+    `summary_processes` worker processes (one per CPU by default, at most
+    `default_processes`).
+    """
+
+    data_name = "summaries.sqlite3"
+    # Modules summarized by a worker at a time.
+    chunk_size = 256
+    # Each worker is a Python interpreter, their number is capped on large machines.
+    default_processes = min(4, os.cpu_count() or 1)
+
+    def __init__(self, project: Project):
+        # Shared through `get_module_summaries`, which must not keep the project alive.
+        self._project = weakref.proxy(project)
+        self._project_lock = get_project_lock(project)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._connection = self._connect(project)
+        # (id, modification time, size) of the indexed modules by path.
+        self._files: dict[str, tuple[int, int, int]] = {
+            path: (file_id, mtime, size)
+            for file_id, path, mtime, size in self._connection.execute(
+                "SELECT id, path, mtime, size FROM files"
+            )
+        }
+
+    def _connect(self, project: Project) -> sqlite3.Connection:
+        """
+        Open the database in the rope folder, or in memory without one.
+        A database of another schema version is built again.
+        """
+        path = ":memory:"
+        if project.ropefolder is not None:
+            path = os.path.join(project.ropefolder.real_path, self.data_name)
+
+        connection = None
+        try:
+            connection = sqlite3.connect(path, check_same_thread=False)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as exception:
+            logging.warning("Module summaries %s discarded: %s", path, exception)
+            if connection is not None:
+                connection.close()
+            if path != ":memory:":
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            connection = sqlite3.connect(path, check_same_thread=False)
+            version = 0
+
+        if version != _SCHEMA_VERSION:
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS imports")
+                connection.execute("DROP TABLE IF EXISTS identifiers")
+                connection.execute("DROP TABLE IF EXISTS files")
+                connection.executescript(_SCHEMA)
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        return connection
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """
+        Close the database, before closing the project.
+        `get_module_summaries` then opens it again.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._connection.close()
+
+    def _is_fresh(self, resource: File) -> bool:
+        entry = self._files.get(resource.path)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(resource.real_path)
+        except OSError:
+            return False
+        return entry[1:] == (stat.st_mtime_ns, stat.st_size)
+
+    def _get_stale(self, resources: Iterable[File]) -> list[tuple[str, str]]:
+        return [
+            (resource.path, resource.real_path)
+            for resource in resources
+            if not self._is_fresh(resource)
+        ]
+
+    def _forget(self, paths: Iterable[str]):
+        for path in paths:
+            entry = self._files.pop(path, None)
+            if entry is not None:
+                self._connection.execute(
+                    "DELETE FROM identifiers WHERE file = ?", (entry[0],)
+                )
+                self._connection.execute(
+                    "DELETE FROM imports WHERE file = ?", (entry[0],)
+                )
+                self._connection.execute("DELETE FROM files WHERE id = ?", (entry[0],))
+
+    def _store(self, summaries: list[tuple[str, _Summary]]):
+        with self._lock, self._connection:
+            self._forget(path for path, _ in summaries)
+            for path, (mtime, size, identifiers, imports) in summaries:
+                file_id = self._connection.execute(
+                    "INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                    (path, mtime, size),
+                ).lastrowid
+                self._connection.executemany(
+                    "INSERT INTO identifiers (identifier, file) VALUES (?, ?)",
+                    ((identifier, file_id) for identifier in identifiers),
+                )
+                self._connection.executemany(
+                    "INSERT INTO imports (module, file) VALUES (?, ?)",
+                    ((module, file_id) for module in imports),
+                )
+                self._files[path] = (file_id, mtime, size)
+
+    def build(self, task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE) -> int:
+        """
+        Summarize the modules of the project not summarized yet, or modified since.
+        Returns the number of modules summarized.
+
+        The modules are listed holding the project lock, see `get_project_lock`,
+        the rest does not call rope.
+        """
+        with self._project_lock:
+            resources = self._project.get_python_files()
+        stale = self._get_stale(resources)
+        chunks = [
+            stale[index : index + self.chunk_size]
+            for index in range(0, len(stale), self.chunk_size)
+        ]
+
+        job_set = task_handle.create_jobset("Summarizing Modules", len(chunks))
+        processes = self._project.prefs.get(
+            "summary_processes", self.default_processes
+        )
+        if processes > 1 and len(chunks) > 1:
+            pool = get_process_pool(processes)
+            futures = [pool.submit(summarize_modules, chunk) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    job_set.started_job("Summarizing Modules")
+                    self._store(future.result())
+                    job_set.finished_job()
+            finally:
+                for future in futures:
+                    future.cancel()
+        else:
+            for chunk in chunks:
+                job_set.started_job(chunk[0][0])
+                self._store(summarize_modules(chunk))
+                job_set.finished_job()
+
+        # Forget the modules removed since.
+        paths = {resource.path for resource in resources}
+        with self._lock, self._connection:
+            self._forget([path for path in self._files if path not in paths])
+
+        logging.info("Modules summarized: %d of %d.", len(stale), len(resources))
+        return len(stale)
+
+    def filter(self, resources: list[File], name: str) -> list[File]:
+        """
+        Get the `resources` whose source contains the identifier `name`, in order.
+        Those not summarized yet, or modified since, are summarized first.
+        """
+        self._store(summarize_modules(self._get_stale(resources)))
+
+        with self._lock:
+            candidates = {
+                path
+                for (path,) in self._connection.execute(
+                    "SELECT files.path FROM identifiers"
+                    " JOIN files ON files.id = identifiers.file"
+                    " WHERE identifiers.identifier = ?",
+                    (name,),
+                )
+            }
+            files = self._files
+        return [
+            resource
+            for resource in resources
+            if resource.path in candidates or resource.path not in files
+        ]
+
+    def get_importers(self, modules: list[Resource], resources: list[File]) -> set[str]:
+        """
+        Get the paths of the modules of `resources`, the python files of the project,
+        importing any of `modules`, modules or packages, directly or through modules
+        importing them, transitively.
+        The modules not summarized yet, or modified since, are summarized first.
+
+        The result errs on the side of too many modules: any import a module may be
+        reached through counts, and the modules that do not parse import anything.
+        Unreadable modules are left out.
+        """
+        self._store(summarize_modules(self._get_stale(resources)))
+
+        importers = set()
+        pending = [module.path for module in modules]
+        with self._lock:
+            while pending:
+                exact, ranges = _get_import_patterns(pending.pop())
+                conditions = " OR ".join(
+                    [f"imports.module IN ({', '.join('?' * len(exact))})"]
+                    + ["(imports.module > ? AND imports.module < ?)"] * len(ranges)
+                )
+                for (path,) in self._connection.execute(
+                    "SELECT DISTINCT files.path FROM imports"
+                    " JOIN files ON files.id = imports.file"
+                    f" WHERE {conditions}",
+                    exact + [bound for bounds in ranges for bound in bounds],
+                ):
+                    if path not in importers:
+                        importers.add(path)
+                        pending.append(path)
+        return importers
+
+
+_module_summaries: "weakref.WeakKeyDictionary[Project, ModuleSummaries]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_module_summaries(project: Project) -> ModuleSummaries:
+    """
+    Get the module summaries of `project`, shared by the whole application.
+    """
+    summaries = _module_summaries.get(project)
+    if summaries is None or summaries.closed:
+        summaries = _module_summaries[project] = ModuleSummaries(project)
+    return summaries
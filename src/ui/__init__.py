@@ -5,6 +5,26 @@ Classes in other modules, such as `mainwindow.MainWindow`, inherit from `ui_main
 , and so on.
 """
 
-from ui.mainwindow import MainWindow
-from ui.rename import RenameDialog
-from ui.move import MoveDialog
+# The classes are imported on first access, see `__getattr__`.
+_lazy_objects = {
+    "MainWindow": "ui.mainwindow.MainWindow",
+    "RenameDialog": "ui.rename.RenameDialog",
+    "MoveDialog": "ui.move.MoveDialog",
+    "DestinationDialog": "ui.destination.DestinationDialog",
+}
+
+__all__ = list(_lazy_objects)
+
+
+def __getattr__(name: str):
+    # pylint:disable=import-outside-toplevel
+    from utilities import import_object
+
+    try:
+        path = _lazy_objects[name]
+    except KeyError:
+        raise AttributeError(f"module 'ui' has no attribute {name!r}") from None
+
+    obj = import_object(path)
+    globals()[name] = obj
+    return obj
@@ -11,22 +11,49 @@
 """
 Base classes for dialogs.
 """
+import functools
 import logging
 from abc import abstractmethod
-from typing import Union
+from typing import Any, Hashable, Union
 
 from PyQt6.QtWidgets import QDialog, QWidget, QMessageBox
-from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtCore import QThreadPool, pyqtSlot
 from rope.base.resources import Resource
 from rope.base.project import Project
 from rope.base.change import ChangeSet
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
+
+from models import ChangesModel
+from ui.changes import compute_in_background, perform_in_background
+from utilities import get_modification_times, get_project_lock
+from workers import RopeTask, get_preview_pool
 
 
 class RefactorDialog(QDialog):
     """
     The base class for all refactor dialog.
+    The `_ui` of subclasses provides `treeView_preview`, `progressBar` and `pushButton_cancel`.
+    Rope is called holding the project lock, see `get_project_lock`.
     """
 
+    def __init__(self, parent: QWidget, project: Project):
+        super().__init__(parent)
+
+        self._project = project
+        self._project_lock = get_project_lock(project)
+        self._executed_changes: Union[None, ChangeSet] = None
+        # (inputs, changes, modification times of the touched files)
+        self._cached_changes: Union[None, tuple[Any, ChangeSet, dict]] = None
+        # The running preview computation.
+        self._task: Union[None, RopeTask] = None
+
+    @property
+    def executed_changes(self) -> Union[None, ChangeSet]:
+        """
+        The changes performed when the dialog was accepted, or `None`.
+        """
+        return self._executed_changes
+
     @pyqtSlot()
     def accept(self):
         """
@@ -41,37 +68,170 @@ class RefactorDialog(QDialog):
         if ifok == QMessageBox.StandardButton.No:
             return
 
-        try:
-            self._changes.do()
-            super().accept()
-            logging.info("Dialog: %s executed.", type(self))
-        except PermissionError as exception:
-            QMessageBox.warning(
-                self,
-                "Warning",
-                str(exception),
-                QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.No,
+        self.cancel_preview()
+        inputs = self._inputs
+        changes = self._get_cached_changes(inputs)
+        if changes is None:
+            # Not previewed, or the previewed modules changed since.
+            changes = compute_in_background(
+                self, self._project, functools.partial(self._get_changes, inputs)
             )
+            if changes is None:
+                return
+            self._cache_changes(inputs, changes)
 
-    @abstractmethod
+        if not perform_in_background(self, self._project, changes):
+            return
+
+        self._cached_changes = None
+        self._executed_changes = changes
+        super().accept()
+        logging.info("Dialog: %s executed.", type(self))
+
+    @pyqtSlot()
     def preview(self):
         """
         Preview the changes that refactoring will bring.
+        The changes are computed in the background, replacing any running computation.
+        The previews run one at a time, so the new one waits for the cancelled one.
+        """
+        self.cancel_preview()
+
+        inputs = self._inputs
+        changes = self._get_cached_changes(inputs)
+        if changes is not None:
+            self._show_preview(changes)
+            return
+
+        task = RopeTask(
+            functools.partial(self._get_changes, inputs),
+            f"Preview {type(self).__name__}",
+            self._project_lock,
+        )
+        task.signals.progress.connect(self._show_progress)
+        task.signals.finished.connect(functools.partial(self._finish_preview, task, inputs))
+        task.signals.failed.connect(functools.partial(self._fail_preview, task))
+        task.signals.cancelled.connect(functools.partial(self._end_preview, task))
+
+        self._task = task
+        self._clear_preview()
+        self._ui.progressBar.setRange(0, 0)
+        self._ui.pushButton_cancel.setEnabled(True)
+        get_preview_pool().start(task)
+
+    @pyqtSlot()
+    def cancel_preview(self):
         """
+        Cancel the running preview computation, if any.
+        """
+        if self._task is None:
+            return
+
+        self._task.stop()
+        self._end_preview(self._task)
+        logging.info("Dialog: %s preview cancelled.", type(self))
+
+    def done(self, a0: int):
+        self.cancel_preview()
+        super().done(a0)
+
+    @pyqtSlot(int)
+    def _show_progress(self, percent: int):
+        if percent < 0:
+            self._ui.progressBar.setRange(0, 0)
+        else:
+            self._ui.progressBar.setRange(0, 100)
+            self._ui.progressBar.setValue(percent)
+
+    def _end_preview(self, task: RopeTask):
+        if task is not self._task:
+            return
+
+        self._task = None
+        self._ui.progressBar.setRange(0, 100)
+        self._ui.progressBar.setValue(0)
+        self._ui.pushButton_cancel.setEnabled(False)
+
+    def _finish_preview(self, task: RopeTask, inputs: Hashable, changes: ChangeSet):
+        if task is not self._task:
+            return
+
+        self._end_preview(task)
+        self._cache_changes(inputs, changes)
+        self._show_preview(changes)
+
+    def _fail_preview(self, task: RopeTask, exception: Exception):
+        if task is not self._task:
+            return
+
+        self._end_preview(task)
+        self._preview_failed(exception)
+
+    def _show_preview(self, changes: ChangeSet):
+        """
+        List the changed files, their diffs are computed once expanded.
+        """
+        self._ui.progressBar.setValue(100)
+        self._clear_preview()
+        model = ChangesModel(changes, self)
+        self._ui.treeView_preview.setModel(model)
+        self._ui.treeView_preview.collapsed.connect(model.release)
+        if model.rowCount() == 1:
+            self._ui.treeView_preview.expandAll()
+
+    def _clear_preview(self):
+        view = self._ui.treeView_preview
+        model = view.model()
+        view.setModel(None)
+        if model is not None:
+            model.deleteLater()
+
+    def _preview_failed(self, exception: Exception):
+        """
+        Report an exception raised while computing the preview.
+        """
+        QMessageBox.warning(
+            self, "Warning", str(exception), QMessageBox.StandardButton.Ok
+        )
+        self._clear_preview()
 
     @property
     @abstractmethod
-    def _changes(self) -> ChangeSet:
-        pass
+    def _inputs(self) -> Hashable:
+        """
+        The user inputs the changes are computed from.
+        """
 
-    @property
-    def _description(self) -> str:
-        return self._changes.get_description()  # type: ignore
+    @abstractmethod
+    def _get_changes(
+        self, inputs: Hashable, task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE
+    ) -> ChangeSet:
+        """
+        Compute the changes for `inputs` from scratch.
+        This may run outside of the GUI thread, so the interface must not be accessed.
+        """
+
+    def _get_cached_changes(self, inputs: Hashable) -> Union[None, ChangeSet]:
+        if self._cached_changes is None:
+            return None
+
+        cached_inputs, changes, times = self._cached_changes
+        if cached_inputs != inputs or get_modification_times(times) != times:
+            return None
+        return changes
+
+    def _cache_changes(self, inputs: Hashable, changes: ChangeSet):
+        times = get_modification_times(
+            resource.real_path for resource in changes.get_changed_resources()
+        )
+        self._cached_changes = (inputs, changes, times)
 
 
 class IdentifierRefactorDialog(RefactorDialog):
     """
     The base class for all identifier refactor dialog.
+    The `_ui` of subclasses also provides `comboBox_scope`, see `_setup_scope`,
+    and `label_affected`, see `count_affected`.
     """
 
     # pylint:disable=abstract-method
@@ -82,9 +242,102 @@ class IdentifierRefactorDialog(RefactorDialog):
         project: Project,
         resource: Resource,
         offset: Union[None, int],
+        folders: Union[None, list[Resource]] = None,
     ):
-        super().__init__(parent)
+        super().__init__(parent, project)
 
-        self._project = project
         self._resource = resource
         self._offset = offset
+        # The folders offered as scope, such as those selected in the project tree.
+        self._folders = folders or []
+        # The running count of the affected modules.
+        self._counting: Union[None, RopeTask] = None
+
+    def done(self, a0: int):
+        if self._counting is not None:
+            self._counting.stop()
+        super().done(a0)
+
+    def _setup_scope(self):
+        """
+        Offer the scopes the refactoring can be restricted to:
+        the whole project, the current module, or the folders.
+        """
+        combo_box = self._ui.comboBox_scope
+        combo_box.blockSignals(True)
+        combo_box.addItem("Whole Project", None)
+
+        module = self._resource
+        if module.is_folder() and module.has_child("__init__.py"):
+            module = module.get_child("__init__.py")
+        if not module.is_folder():
+            combo_box.addItem(f"Current Module: {module.path}", (module,))
+
+        if self._folders:
+            names = ", ".join(folder.path for folder in self._folders)
+            combo_box.addItem(f"Folders: {names}", tuple(self._folders))
+        combo_box.blockSignals(False)
+
+    @property
+    def _scope(self) -> Union[None, tuple[Resource, ...]]:
+        """
+        The modules and folders the refactoring is restricted to,
+        or `None` for the whole project.
+        """
+        return self._ui.comboBox_scope.currentData()
+
+    @pyqtSlot()
+    def change_scope(self):
+        """
+        Preview again in the new scope, if a preview is shown or running.
+        """
+        if self._task is not None or self._ui.treeView_preview.model() is not None:
+            self.preview()
+
+    @pyqtSlot()
+    def count_affected(self):
+        """
+        Count the modules the refactoring may change in the current scope,
+        in the background, before any of them is analyzed.
+        """
+        if self._counting is not None:
+            self._counting.stop()
+
+        task = RopeTask(
+            functools.partial(self._get_affected, self._inputs),
+            "Count Affected Modules",
+            self._project_lock,
+        )
+        task.signals.finished.connect(functools.partial(self._finish_counting, task))
+        task.signals.failed.connect(functools.partial(self._fail_counting, task))
+
+        self._counting = task
+        self._ui.label_affected.setText("Counting affected modules...")
+        QThreadPool.globalInstance().start(task)
+
+    def _finish_counting(self, task: RopeTask, resources: list[Resource]):
+        if task is not self._counting:
+            return
+
+        self._counting = None
+        self._ui.label_affected.setText(f"{len(resources)} modules affected")
+
+    def _fail_counting(self, task: RopeTask, exception: Exception):
+        if task is not self._counting:
+            return
+
+        # The preview reports the same exception.
+        self._counting = None
+        self._ui.label_affected.clear()
+        logging.info(
+            "Dialog: %s affected modules not counted: %s", type(self), exception
+        )
+
+    @abstractmethod
+    def _get_affected(
+        self, inputs: Hashable, task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE
+    ) -> list[Resource]:
+        """
+        Get the modules the changes for `inputs` may touch, without computing them.
+        This may run outside of the GUI thread, so the interface must not be accessed.
+        """
@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------------
+# Name:        changes
+# Purpose:     Compute and perform change sets in the background.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Compute and perform change sets in the background.
+"""
+import functools
+import logging
+from typing import Any, Callable, Union
+
+from PyQt6.QtCore import QEventLoop, QThreadPool, Qt
+from PyQt6.QtWidgets import QMessageBox, QProgressDialog, QWidget
+from rope.base.change import ChangeSet, count_changes
+from rope.base.project import Project
+from rope.base.taskhandle import TaskHandle
+
+from refactorings import perform_changes
+from utilities import get_project_lock
+from workers import RopeTask
+
+
+def _run_in_background(parent: QWidget, task: RopeTask, label: str) -> tuple[str, Any]:
+    """
+    Run `task` in the thread pool, showing its progress in a dialog that can
+    cancel it. The dialog is shown at once, so the window stays responsive but
+    takes no input until the task is done.
+
+    Returns:
+        "finished" and the result, "cancelled" and `None`, or "failed" and the
+        exception.
+    """
+    progress = QProgressDialog(label, "Cancel", 0, 100, parent)
+    progress.setWindowTitle("Refactoring")
+    progress.setWindowModality(Qt.WindowModality.WindowModal)
+    progress.setAutoClose(False)
+    progress.setAutoReset(False)
+
+    loop = QEventLoop()
+    outcome = []
+
+    def finish(state: str, value: Any = None):
+        outcome.append((state, value))
+        loop.quit()
+
+    task.signals.progress.connect(lambda percent: progress.setValue(max(percent, 0)))
+    task.signals.finished.connect(lambda result: finish("finished", result))
+    task.signals.cancelled.connect(lambda: finish("cancelled"))
+    task.signals.failed.connect(lambda exception: finish("failed", exception))
+    progress.canceled.connect(task.stop)
+
+    progress.show()
+    QThreadPool.globalInstance().start(task)
+    loop.exec()
+    progress.close()
+    return outcome[0]
+
+
+def compute_in_background(
+    parent: QWidget, project: Project, function: Callable[[TaskHandle], ChangeSet]
+) -> Union[None, ChangeSet]:
+    """
+    Compute changes with `function` in the thread pool, like
+    `perform_in_background`. A failure is reported.
+
+    Returns:
+        The changes, or `None` if they were cancelled or failed.
+    """
+    task = RopeTask(function, "Computing Changes", get_project_lock(project))
+    state, value = _run_in_background(parent, task, "Computing changes...")
+    if state == "failed":
+        QMessageBox.warning(
+            parent, "Warning", str(value), QMessageBox.StandardButton.Ok
+        )
+    return value if state == "finished" else None
+
+
+def perform_in_background(
+    parent: QWidget, project: Project, changes: ChangeSet
+) -> bool:
+    """
+    Perform `changes` to `project` in the thread pool, showing their progress in
+    a dialog that can cancel them. The window stays responsive but modal until
+    they are done. A cancelled or failed change set is rolled back.
+
+    Returns:
+        Whether the changes were performed.
+    """
+    task = RopeTask(
+        functools.partial(perform_changes, changes),
+        str(changes),
+        get_project_lock(project),
+    )
+    state, exception = _run_in_background(
+        parent, task, f"Performing {count_changes(changes)} changes..."
+    )
+
+    logging.info("Changes <%s> %s.", changes, state)
+    if state == "cancelled":
+        QMessageBox.information(
+            parent,
+            "Information",
+            "The refactoring was cancelled, the changed files have been restored.",
+            QMessageBox.StandardButton.Ok,
+        )
+    elif state == "failed":
+        QMessageBox.warning(
+            parent,
+            "Warning",
+            f"{exception}\nThe changed files have been restored.",
+            QMessageBox.StandardButton.Ok,
+        )
+    return state == "finished"
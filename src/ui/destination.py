@@ -0,0 +1,103 @@
+# -------------------------------------------------------------------------------
+# Name:        destination
+# Purpose:     The dialog that picks a destination among the project paths.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+The dialog that picks a destination among the project paths.
+"""
+from typing import Union
+
+from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSlot
+from PyQt6.QtWidgets import QApplication, QDialog, QWidget
+
+from models import FuzzyListModel
+from ui.generated.ui_destination import Ui_Dialog
+
+
+class DestinationDialog(QDialog):
+    """
+    The dialog that picks a destination among the project paths,
+    with incremental fuzzy search.
+    """
+
+    # Keys of the search field that move the selection in the list.
+    _navigation_keys = {
+        Qt.Key.Key_Up,
+        Qt.Key.Key_Down,
+        Qt.Key.Key_PageUp,
+        Qt.Key.Key_PageDown,
+    }
+
+    def __init__(self, parent: Union[None, QWidget], title: str, items: list[str]):
+        super().__init__(parent)
+
+        # Initialize data context
+        self._model = FuzzyListModel(items, self)
+
+        # Initialize the interface
+        self._ui = Ui_Dialog()
+        self._ui.setupUi(self)
+        self.setWindowTitle(title)
+
+        self._ui.listView_destinations.setModel(self._model)
+        self._ui.lineEdit_filter.installEventFilter(self)
+        self._show_matches()
+
+    @classmethod
+    def get_item(
+        cls, parent: Union[None, QWidget], title: str, items: list[str]
+    ) -> tuple[Union[None, str], bool]:
+        """
+        Let the user pick one of `items`, like `QInputDialog.getItem`.
+        `None` if nothing is picked, `""` is the project root.
+        """
+        dialog = cls(parent, title, items)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            return dialog.destination, True
+        return None, False
+
+    @property
+    def destination(self) -> Union[None, str]:
+        index = self._ui.listView_destinations.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(Qt.ItemDataRole.UserRole)
+
+    @pyqtSlot(str)
+    def set_pattern(self, text: str):
+        """
+        Show the best destinations matching `text`.
+        """
+        self._model.set_pattern(text)
+        self._show_matches()
+
+    def _show_matches(self):
+        view = self._ui.listView_destinations
+        if self._model.rowCount():
+            view.setCurrentIndex(self._model.index(0))
+
+        self._ui.label_count.setText(
+            f"{min(self._model.match_count, self._model.limit)} of "
+            f"{self._model.match_count} matches, {self._model.item_count} in total"
+        )
+
+    def eventFilter(self, a0: QObject, a1: QEvent) -> bool:  # pylint:disable=invalid-name
+        if (
+            a0 is self._ui.lineEdit_filter
+            and a1.type() == QEvent.Type.KeyPress
+            and a1.key() in self._navigation_keys
+        ):
+            QApplication.sendEvent(self._ui.listView_destinations, a1)
+            return True
+        return super().eventFilter(a0, a1)
+
+    def accept(self):
+        if self.destination is None:
+            return
+        super().accept()
@@ -26,10 +26,9 @@ class ExtractDialog(RefactorDialog):
         resource: Resource,
         offsets: tuple[int, int],
     ):
-        super().__init__(parent)
+        super().__init__(parent, project)
 
         # Initialize data context
-        self._project = project
         self._resource = resource
         self._start_offset = offsets[0]
         self._end_offset = offsets[1]
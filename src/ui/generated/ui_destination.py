@@ -0,0 +1,59 @@
+# Form implementation generated from reading ui file 'destination.ui'
+#
+# Created by: PyQt6 UI code generator 6.4.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        Dialog.resize(520, 420)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        Dialog.setFont(font)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Dialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.lineEdit_filter = QtWidgets.QLineEdit(parent=Dialog)
+        self.lineEdit_filter.setClearButtonEnabled(True)
+        self.lineEdit_filter.setObjectName("lineEdit_filter")
+        self.verticalLayout.addWidget(self.lineEdit_filter)
+        self.listView_destinations = QtWidgets.QListView(parent=Dialog)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(False)
+        self.listView_destinations.setFont(font)
+        self.listView_destinations.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.listView_destinations.setUniformItemSizes(True)
+        self.listView_destinations.setObjectName("listView_destinations")
+        self.verticalLayout.addWidget(self.listView_destinations)
+        self.horizontalLayout_count = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_count.setObjectName("horizontalLayout_count")
+        self.label_count = QtWidgets.QLabel(parent=Dialog)
+        self.label_count.setText("")
+        self.label_count.setObjectName("label_count")
+        self.horizontalLayout_count.addWidget(self.label_count)
+        self.buttonBox = QtWidgets.QDialogButtonBox(parent=Dialog)
+        self.buttonBox.setOrientation(QtCore.Qt.Orientation.Horizontal)
+        self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.StandardButton.Cancel|QtWidgets.QDialogButtonBox.StandardButton.Ok)
+        self.buttonBox.setObjectName("buttonBox")
+        self.horizontalLayout_count.addWidget(self.buttonBox)
+        self.verticalLayout.addLayout(self.horizontalLayout_count)
+
+        self.retranslateUi(Dialog)
+        self.buttonBox.accepted.connect(Dialog.accept) # type: ignore
+        self.buttonBox.rejected.connect(Dialog.reject) # type: ignore
+        self.lineEdit_filter.textEdited['QString'].connect(Dialog.set_pattern) # type: ignore
+        self.listView_destinations.activated['QModelIndex'].connect(Dialog.accept) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Select Destination"))
+        self.lineEdit_filter.setPlaceholderText(_translate("Dialog", "Type to search"))
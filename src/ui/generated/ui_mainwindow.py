@@ -46,6 +46,7 @@ class Ui_MainWindow(object):
         self.verticalLayout_project.addWidget(self.label_project)
         self.treeView_project = QtWidgets.QTreeView(parent=self.layoutWidget)
         self.treeView_project.setDragDropMode(QtWidgets.QAbstractItemView.DragDropMode.NoDragDrop)
+        self.treeView_project.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
         self.treeView_project.setHeaderHidden(True)
         self.treeView_project.setObjectName("treeView_project")
         self.verticalLayout_project.addWidget(self.treeView_project)
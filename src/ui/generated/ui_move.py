@@ -50,6 +50,28 @@ class Ui_Dialog(object):
         self.lineEdit_destination.setObjectName("lineEdit_destination")
         self.horizontalLayout_destination.addWidget(self.lineEdit_destination)
         self.verticalLayout.addLayout(self.horizontalLayout_destination)
+        self.horizontalLayout_scope = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_scope.setObjectName("horizontalLayout_scope")
+        self.label_scope = QtWidgets.QLabel(parent=self.layoutWidget)
+        self.label_scope.setObjectName("label_scope")
+        self.horizontalLayout_scope.addWidget(self.label_scope)
+        self.comboBox_scope = QtWidgets.QComboBox(parent=self.layoutWidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.comboBox_scope.sizePolicy().hasHeightForWidth())
+        self.comboBox_scope.setSizePolicy(sizePolicy)
+        self.comboBox_scope.setObjectName("comboBox_scope")
+        self.horizontalLayout_scope.addWidget(self.comboBox_scope)
+        self.label_affected = QtWidgets.QLabel(parent=self.layoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(False)
+        self.label_affected.setFont(font)
+        self.label_affected.setText("")
+        self.label_affected.setObjectName("label_affected")
+        self.horizontalLayout_scope.addWidget(self.label_affected)
+        self.verticalLayout.addLayout(self.horizontalLayout_scope)
         self.horizontalLayout_preview = QtWidgets.QHBoxLayout()
         self.horizontalLayout_preview.setObjectName("horizontalLayout_preview")
         self.label_preview = QtWidgets.QLabel(parent=self.layoutWidget)
@@ -65,19 +87,34 @@ class Ui_Dialog(object):
         self.label_mode.setObjectName("label_mode")
         self.horizontalLayout_preview.addWidget(self.label_mode)
         self.verticalLayout.addLayout(self.horizontalLayout_preview)
-        self.plainTextEdit = QtWidgets.QPlainTextEdit(parent=self.layoutWidget)
+        self.treeView_preview = QtWidgets.QTreeView(parent=self.layoutWidget)
         font = QtGui.QFont()
         font.setPointSize(10)
         font.setBold(False)
-        self.plainTextEdit.setFont(font)
-        self.plainTextEdit.setReadOnly(True)
-        self.plainTextEdit.setObjectName("plainTextEdit")
-        self.verticalLayout.addWidget(self.plainTextEdit)
+        self.treeView_preview.setFont(font)
+        self.treeView_preview.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.treeView_preview.setUniformRowHeights(True)
+        self.treeView_preview.setObjectName("treeView_preview")
+        self.verticalLayout.addWidget(self.treeView_preview)
+        self.horizontalLayout_progress = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_progress.setObjectName("horizontalLayout_progress")
+        self.progressBar = QtWidgets.QProgressBar(parent=self.layoutWidget)
+        self.progressBar.setProperty("value", 0)
+        self.progressBar.setObjectName("progressBar")
+        self.horizontalLayout_progress.addWidget(self.progressBar)
+        self.pushButton_cancel = QtWidgets.QPushButton(parent=self.layoutWidget)
+        self.pushButton_cancel.setEnabled(False)
+        self.pushButton_cancel.setObjectName("pushButton_cancel")
+        self.horizontalLayout_progress.addWidget(self.pushButton_cancel)
+        self.verticalLayout.addLayout(self.horizontalLayout_progress)
 
         self.retranslateUi(Dialog)
         self.buttonBox.accepted.connect(Dialog.accept) # type: ignore
         self.buttonBox.rejected.connect(Dialog.reject) # type: ignore
         self.pushButton_destination.clicked.connect(Dialog.set_destination) # type: ignore
+        self.pushButton_cancel.clicked.connect(Dialog.cancel_preview) # type: ignore
+        self.comboBox_scope.currentIndexChanged['int'].connect(Dialog.change_scope) # type: ignore
+        self.comboBox_scope.currentIndexChanged['int'].connect(Dialog.count_affected) # type: ignore
         QtCore.QMetaObject.connectSlotsByName(Dialog)
 
     def retranslateUi(self, Dialog):
@@ -85,4 +122,8 @@ class Ui_Dialog(object):
         Dialog.setWindowTitle(_translate("Dialog", "Move"))
         self.label_module.setText(_translate("Dialog", "Module/Package"))
         self.pushButton_destination.setText(_translate("Dialog", "Destination"))
+        self.label_scope.setText(_translate("Dialog", "Scope"))
+        self.comboBox_scope.setToolTip(_translate("Dialog", "Restrict the analysis to these modules."))
+        self.label_affected.setToolTip(_translate("Dialog", "The modules the refactoring may change, before analyzing them."))
         self.label_preview.setText(_translate("Dialog", "Preview"))
+        self.pushButton_cancel.setText(_translate("Dialog", "Cancel"))
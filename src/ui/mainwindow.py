@@ -16,17 +16,33 @@ import logging
 import os
 from typing import Union
 
-from PyQt6.QtCore import QModelIndex, pyqtSlot, Qt
-from PyQt6.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QInputDialog
+from PyQt6.QtCore import QModelIndex, QThreadPool, pyqtSlot, Qt
+from PyQt6.QtWidgets import (
+    QMainWindow,
+    QFileDialog,
+    QMessageBox,
+    QInputDialog,
+    QProgressBar,
+)
+from rope.base.change import ChangeSet
 from rope.base.exceptions import BadIdentifierError, ResourceNotFoundError
-from rope.base.project import Project
 from rope.base.resources import Resource
-from rope.refactor.topackage import ModuleToPackage
 
-from ui.rename import RenameDialog
-from ui.move import MoveDialog
 from ui.generated.ui_mainwindow import Ui_MainWindow
-from utilities import get_project_model
+from ui.viewer import SourceViewer
+from analysis import get_module_analyzer
+from indexes import get_module_index
+from models import ProjectModel
+from pruning import get_pruner, open_project
+from summaries import get_module_summaries
+from utilities import get_project_lock, import_object
+from watchers import ProjectWatcher
+from workers import (
+    ProjectScanner,
+    RopeTask,
+    get_background_pool,
+    get_preview_pool,
+)
 
 
 class MainWindow(QMainWindow):
@@ -34,9 +50,10 @@ class MainWindow(QMainWindow):
     Main interface window class.
     """
 
+    # Dialogs by action name, imported on first use to keep startup fast.
     _identifier_refactor_dialogs = {
-        "action_rename": RenameDialog,
-        "action_move": MoveDialog,
+        "action_rename": "ui.rename.RenameDialog",
+        "action_move": "ui.move.MoveDialog",
     }
 
     def __init__(self):
@@ -44,13 +61,29 @@ class MainWindow(QMainWindow):
 
         # Initialize data context
         cwd = os.getcwd()
-        self._project = Project(cwd)
+        self._project = open_project(cwd, save_objectdb=True)
         logging.info("Initialize the current working directory: %s.", cwd)
 
         # Initialize the interface
         self._ui = Ui_MainWindow()
         self._ui.setupUi(self)
 
+        self._scan_progress = QProgressBar()
+        self._scan_progress.setRange(0, 0)
+        self._scan_progress.setMaximumWidth(120)
+        self._scan_progress.hide()
+        self._ui.statusbar.addPermanentWidget(self._scan_progress)
+        self._analysis_progress = QProgressBar()
+        self._analysis_progress.setMaximumWidth(120)
+        self._analysis_progress.setFormat("Analyzing %p%")
+        self._analysis_progress.hide()
+        self._ui.statusbar.addPermanentWidget(self._analysis_progress)
+        self._source_viewer = SourceViewer(self._ui.plainTextEdit_source_code, self)
+        self._scanner: Union[None, ProjectScanner] = None
+        self._watcher: Union[None, ProjectWatcher] = None
+        self._analysis: Union[None, RopeTask] = None
+        self._summarizing: Union[None, RopeTask] = None
+
         # Perform data binding
         self._reset_binding()
 
@@ -58,7 +91,14 @@ class MainWindow(QMainWindow):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop_scan()
+        self._stop_analysis()
+        self._stop_summarizing()
+        get_background_pool().waitForDone()
+        get_preview_pool().waitForDone()
+        QThreadPool.globalInstance().waitForDone()
         logging.info("Project <%s> closed.",self._project.address)
+        get_module_summaries(self._project).close()
         self._project.close()
 
     def _reset_binding(self):
@@ -66,15 +106,195 @@ class MainWindow(QMainWindow):
         - Refresh the project root directory display.
         - Rebuild the project tree.
         - Clear the source code preview area.
+        - Watch the project for changes made by other programs.
+        - Scan the project in the background.
+        - Load the module index in the background.
+        - Summarize the modules in worker processes, for the refactorings to skip
+          those a name does not occur in.
+        - Analyze the modules in the background once the project is scanned.
         """
-        self._project.validate()
-
         self._ui.lineEdit_root.setText(self._project.address)
-        self._ui.treeView_project.setModel(get_project_model(self._project.root))
-        self._ui.plainTextEdit_source_code.clear()
+        self._project_model = ProjectModel(self._project.root)
+        self._ui.treeView_project.setModel(self._project_model)
+        self._source_viewer.clear()
+        self._stop_analysis()
+
+        if self._watcher is not None:
+            self._watcher.deleteLater()
+        self._watcher = ProjectWatcher(self._project, self)
+        self._watcher.folders_changed.connect(self._sync_folders)
+        self._watcher.file_changed.connect(self._reload_source_code)
+        self._start_scan()
+
+        self._module_index = get_module_index(self._project)
+        get_background_pool().start(self._module_index.load)
+        self._module_analyzer = get_module_analyzer(self._project)
+
+        self._stop_summarizing()
+        self._summarizing = RopeTask(
+            get_module_summaries(self._project).build, "Summarizing Modules"
+        )
+        get_background_pool().start(self._summarizing)
 
         logging.info("Class %s: Perform data binding.", MainWindow)
 
+    def _start_scan(self):
+        """
+        Populate the project tree from a background scan, showing its progress.
+        """
+        self._stop_scan()
+
+        self._scanner = ProjectScanner(self._project.root)
+        self._scanner.signals.batch.connect(self._project_model.populate)
+        self._scanner.signals.batch.connect(self._watcher.watch_listings)
+        self._scanner.signals.progress.connect(self._show_scan_progress)
+        self._scanner.signals.finished.connect(self._finish_scan)
+
+        self._scan_progress.show()
+        self._ui.statusbar.showMessage("Scanning project...")
+        get_background_pool().start(self._scanner)
+
+    def _stop_scan(self):
+        if self._scanner is None:
+            return
+
+        self._scanner.stop()
+        self._scanner.signals.batch.disconnect()
+        self._scanner.signals.progress.disconnect()
+        self._scanner.signals.finished.disconnect()
+        self._scanner = None
+
+        self._scan_progress.hide()
+        self._ui.statusbar.clearMessage()
+
+    def _stop_summarizing(self):
+        """
+        Stop summarizing the modules and wait for it, before closing the project.
+        """
+        if self._summarizing is None:
+            return
+
+        self._summarizing.stop()
+        self._summarizing.wait()
+        self._summarizing = None
+
+    @pyqtSlot(int, int)
+    def _show_scan_progress(self, folders: int, modules: int):
+        self._ui.statusbar.showMessage(
+            f"Scanning project: {folders} folders, {modules} modules..."
+        )
+
+    @pyqtSlot(int, int)
+    def _finish_scan(self, folders: int, modules: int):
+        self._scanner = None
+        self._scan_progress.hide()
+        self._ui.statusbar.showMessage(
+            f"Project scanned: {folders} folders, {modules} modules.", 5000
+        )
+        self._start_analysis()
+
+    def _start_analysis(self):
+        """
+        Analyze the modules in the background, so the first refactoring does not
+        wait for rope to analyze them. It is stopped while refactoring.
+        """
+        if (
+            self._analysis is not None
+            or self._scanner is not None
+            or not self._project.prefs.get("idle_analysis", True)
+        ):
+            return
+
+        self._analysis = RopeTask(self._module_analyzer.analyze, "Analyzing Modules")
+        self._analysis.signals.progress.connect(self._analysis_progress.setValue)
+        self._analysis.signals.finished.connect(self._finish_analysis)
+        self._analysis.signals.failed.connect(self._stop_analysis)
+
+        self._analysis_progress.setValue(0)
+        self._analysis_progress.show()
+        get_background_pool().start(self._analysis)
+
+    @pyqtSlot()
+    def _stop_analysis(self):
+        """
+        Stop the analysis and wait for it, rope is then free for the GUI thread.
+        """
+        if self._analysis is None:
+            return
+
+        analysis = self._analysis
+        analysis.stop()
+        analysis.signals.progress.disconnect()
+        analysis.signals.finished.disconnect()
+        analysis.signals.failed.disconnect()
+        self._analysis = None
+        self._analysis_progress.hide()
+        # It stops after the module being analyzed.
+        analysis.wait()
+
+    @pyqtSlot(object)
+    def _finish_analysis(self, count: int):
+        self._analysis = None
+        self._analysis_progress.hide()
+        # Persist the object DB now, not only when the project is closed.
+        with get_project_lock(self._project):
+            self._project.sync()
+        self._ui.statusbar.showMessage(
+            f"Project analyzed: {count} modules modified since last time.", 5000
+        )
+
+    @pyqtSlot(list)
+    def _sync_folders(self, folders: list[Resource]):
+        """
+        Synchronize rope, the project tree and the module index with `folders`,
+        altered on the file system. Only these folders are validated.
+        The folders under a modified `.gitignore` are indexed again.
+        """
+        with get_project_lock(self._project):
+            pruned = [
+                self._project.get_folder(path)
+                for path in get_pruner(self._project).refresh()
+            ]
+            for folder in folders:
+                self._project.validate(folder)
+        for folder in folders:
+            self._project_model.refresh(folder)
+            self._module_index.refresh(folder)
+        for folder in pruned:
+            self._module_index.rebuild(folder)
+
+        logging.info("Class %s: Synchronize folders: %d.", MainWindow, len(folders))
+
+    @pyqtSlot(object)
+    def _reload_source_code(self, resource: Resource):
+        """
+        Display the source code of the watched module again, e.g. after formatting.
+        """
+        if not resource.exists():
+            return
+
+        with get_project_lock(self._project):
+            self._project.validate(resource)
+        self._source_viewer.show_resource(resource, keep_position=True)
+        logging.info("Module %s reloaded.", resource.path)
+
+    def _update_binding(self, changes: ChangeSet):
+        """
+        - Update the project tree nodes, the module index and the cached sources
+          touched by the performed `changes`.
+        - Clear the source code preview area.
+
+        The changes are performed by rope, which keeps the project up to date,
+        so there is no need to revalidate it.
+        """
+        self._project_model.update(changes)
+        self._module_index.update(changes)
+        self._watcher.watch_file(None)
+        self._source_viewer.update(changes)
+        self._source_viewer.clear()
+
+        logging.info("Class %s: Update data binding: %s.", MainWindow, changes)
+
     def _get_resource(self, index: QModelIndex) -> Resource:
         """
         Get a resource in a project.
@@ -105,13 +325,25 @@ class MainWindow(QMainWindow):
         resource = self._get_resource(index)
         return resource
 
+    def _get_scope_folders(self, resource: Resource) -> list[Resource]:
+        """
+        Get the folders selected in the project tree, or else the folder of `resource`.
+        The project root is left out, it is the whole project.
+        """
+        indexes = self._ui.treeView_project.selectionModel().selectedIndexes()
+        folders = [self._get_resource(index) for index in indexes]
+        folders = [folder for folder in folders if folder.is_folder()]
+        if not folders:
+            folders = [resource if resource.is_folder() else resource.parent]
+        return [folder for folder in folders if folder != self._project.root]
+
     def _get_offset(self) -> Union[None, int]:
         text_edit = self._ui.plainTextEdit_source_code
         if not text_edit.hasFocus():
             offset = None
         else:
             cursor = text_edit.textCursor()
-            offset = cursor.selectionStart()
+            offset = self._source_viewer.get_offset(cursor.selectionStart())
         return offset
 
     @pyqtSlot()
@@ -136,8 +368,12 @@ class MainWindow(QMainWindow):
         if folder_path:
             logging.info('Project <%s> closed. Set Root Directory: %s',self._project.address,folder_path)
 
-            self._project.close()
-            self._project = Project(folder_path)
+            self._stop_analysis()
+            self._stop_summarizing()
+            with get_project_lock(self._project):
+                get_module_summaries(self._project).close()
+                self._project.close()
+            self._project = open_project(folder_path, save_objectdb=True)
             self._reset_binding()
 
     @pyqtSlot(QModelIndex)
@@ -147,23 +383,29 @@ class MainWindow(QMainWindow):
         If a folder is selected, the source code will be blank.
         """
         resource = self._get_resource(index)
-        text_edit = self._ui.plainTextEdit_source_code
 
         # Validate resource
         if resource == self._project.root:  # A non-existent resource is selected.
             QMessageBox.warning(
                 self,
                 "Warning",
-                "Ineffective resources! The project has been revalidated!",
+                "Ineffective resources! The folder has been revalidated!",
                 QMessageBox.StandardButton.Ok,
             )
-            self._reset_binding()
+            folder = self._project.root
+            if index.parent().isValid():
+                folder = self._get_resource(index.parent())
+            self._watcher.watch_file(None)
+            self._source_viewer.clear()
+            self._sync_folders([folder])
         elif resource.is_folder():
             logging.info("Package %s selected.", resource.path)
-            text_edit.clear()
+            self._watcher.watch_file(None)
+            self._source_viewer.clear()
         else:
             logging.info("Module %s read.", resource.path)
-            text_edit.setPlainText(resource.read())
+            self._watcher.watch_file(resource)
+            self._source_viewer.show_resource(resource)
 
     @pyqtSlot()
     def identifier_refactor(self):
@@ -186,10 +428,12 @@ class MainWindow(QMainWindow):
         offset = self._get_offset()
 
         # Determine dialog and refactor
+        self._stop_analysis()
         try:
             action_name = self.sender().objectName()
-            dialog = self._identifier_refactor_dialogs[action_name](
-                self, self._project, resource, offset
+            dialog_class = import_object(self._identifier_refactor_dialogs[action_name])
+            dialog = dialog_class(
+                self, self._project, resource, offset, self._get_scope_folders(resource)
             )
             dialog.exec()
         except KeyError:
@@ -204,7 +448,10 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", str(exception))
             return
         finally:
-            self._reset_binding()
+            self._start_analysis()
+
+        if dialog.executed_changes is not None:
+            self._update_binding(dialog.executed_changes)
 
     @pyqtSlot()
     def create_resource(self):
@@ -228,15 +475,17 @@ class MainWindow(QMainWindow):
             return
 
         action_name = self.sender().objectName()
-        if action_name == "action_create_package":
-            folder = resource.create_folder(text)
-            folder.create_file("__init__.py")
-            logging.info("Create Package: %s", text)
-        elif action_name == "action_create_module":
-            resource.create_file(text + ".py")
-            logging.info("Create Module: %s", text)
-
-        self._reset_binding()
+        with get_project_lock(self._project):
+            if action_name == "action_create_package":
+                folder = resource.create_folder(text)
+                folder.create_file("__init__.py")
+                logging.info("Create Package: %s", text)
+            elif action_name == "action_create_module":
+                resource.create_file(text + ".py")
+                logging.info("Create Module: %s", text)
+
+        self._project_model.refresh(resource)
+        self._module_index.refresh(resource)
 
     @pyqtSlot()
     def module2package(self):
@@ -253,14 +502,24 @@ class MainWindow(QMainWindow):
             )
             return
 
-        refactor = ModuleToPackage(self._project, resource)
-        changes = refactor.get_changes()
-        ifok = QMessageBox.question(
-            self,
-            "Question",
-            "Preview:\n" + changes.get_description(),
-            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.No,
-        )
-        if ifok == QMessageBox.StandardButton.Ok:
-            changes.do()
-            self._reset_binding()
+        # pylint:disable=import-outside-toplevel
+        from rope.refactor.topackage import ModuleToPackage
+
+        from ui.changes import perform_in_background
+
+        self._stop_analysis()
+        try:
+            with get_project_lock(self._project):
+                changes = ModuleToPackage(self._project, resource).get_changes()
+            ifok = QMessageBox.question(
+                self,
+                "Question",
+                "Preview:\n" + changes.get_description(),
+                QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.No,
+            )
+            if ifok == QMessageBox.StandardButton.Ok and perform_in_background(
+                self, self._project, changes
+            ):
+                self._update_binding(changes)
+        finally:
+            self._start_analysis()
@@ -20,11 +20,17 @@ from rope.refactor.move import create_move, MoveGlobal, MoveModule, MoveMethod
 from rope.base.resources import Resource
 from rope.base.project import Project
 from rope.base.change import ChangeSet
-from rope.base.exceptions import RefactoringError
-
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
+
+from indexes import get_module_index
+from refactorings import (
+    get_move_destination,
+    get_move_resources,
+    get_scope_resources,
+)
 from ui.generated.ui_move import Ui_Dialog
 from ui.base import IdentifierRefactorDialog
-from utilities import get_modules, get_packages
+from ui.destination import DestinationDialog
 
 
 class MoveDialog(IdentifierRefactorDialog):
@@ -38,11 +44,15 @@ class MoveDialog(IdentifierRefactorDialog):
         project: Project,
         resource: Resource,
         offset: Union[None, int],
+        folders: Union[None, list[Resource]] = None,
     ):
-        super().__init__(parent, project, resource, offset)
+        super().__init__(parent, project, resource, offset, folders)
 
         # Initialize data context
-        self._move = create_move(self._project, self._resource, self._offset)
+        with self._project_lock:
+            self._move = create_move(self._project, self._resource, self._offset)
+        # The picked destination, `""` being the project root.
+        self._destination: Union[None, str] = None
         logging.info("Move on %s", self._resource.path)
 
         # Initialize the interface
@@ -51,6 +61,8 @@ class MoveDialog(IdentifierRefactorDialog):
 
         self._ui.label_mode.setText(type(self._move).__name__)
         self._ui.lineEdit_module.setText(resource.path)
+        self._setup_scope()
+        self.count_affected()
 
     @pyqtSlot()
     def set_destination(self):
@@ -60,52 +72,67 @@ class MoveDialog(IdentifierRefactorDialog):
         cls = type(self._move)
 
         if cls == MoveModule:
-            text, ifok = QInputDialog.getItem(
-                self,
-                "Select Package",
-                "Package",
-                (package.path for package in get_packages(self._project)),
-                0,
-                False,
+            text, ifok = DestinationDialog.get_item(
+                self, "Select Package", get_module_index(self._project).get_packages()
             )
         elif cls == MoveGlobal:
-            text, ifok = QInputDialog.getItem(
-                self,
-                "Select Module",
-                "Module",
-                (module.path for module in get_modules(self._project)),
-                0,
-                False,
+            text, ifok = DestinationDialog.get_item(
+                self, "Select Module", get_module_index(self._project).get_modules()
             )
         elif cls == MoveMethod:
             text, ifok = QInputDialog.getText(self, "Enter Attribute", "Attribute")
+            ifok = ifok and bool(text)
 
         if ifok:
-            self._ui.lineEdit_destination.setText(text)
+            self._destination = text
+            self._ui.lineEdit_destination.setText(text or "<project root>")
+            self.count_affected()
             self.preview()
 
-    def preview(self):
-        try:
-            description = self._description
-        except RefactoringError as exception:
-            QMessageBox.warning(
-                self, "Warning", str(exception), QMessageBox.StandardButton.Ok
+    @pyqtSlot()
+    def accept(self):
+        if self._destination is None:
+            QMessageBox.information(
+                self,
+                "Information",
+                "Please select a destination!",
+                QMessageBox.StandardButton.Ok,
             )
-            self._ui.lineEdit_destination.clear()
-            self._ui.plainTextEdit.clear()
             return
+        super().accept()
 
-        self._ui.plainTextEdit.setPlainText(description)
+    def _preview_failed(self, exception: Exception):
+        super()._preview_failed(exception)
+        self._destination = None
+        self._ui.lineEdit_destination.clear()
 
     @property
-    def _destination(self) -> Union[str, Resource]:
-        text = self._ui.lineEdit_destination.text()
+    def _inputs(self) -> tuple[Union[None, str], Union[None, tuple[Resource, ...]]]:
+        return self._destination, self._scope
 
-        if isinstance(self._move, (MoveGlobal, MoveModule)):
-            return self._project.get_resource(text)
-
-        return text
-
-    @property
-    def _changes(self) -> ChangeSet:
-        return self._move.get_changes(self._destination)
+    def _get_affected(
+        self,
+        inputs: tuple[Union[None, str], Union[None, tuple[Resource, ...]]],
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> list[Resource]:
+        text, scope = inputs
+        # Before the destination is set, the modules depending on the source count.
+        destination = None
+        if text is not None:
+            destination = get_move_destination(self._project, self._move, text)
+        resources = None if scope is None else get_scope_resources(scope)
+        return get_move_resources(self._move, destination, resources)
+
+    def _get_changes(
+        self,
+        inputs: tuple[Union[None, str], Union[None, tuple[Resource, ...]]],
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> ChangeSet:
+        destination, scope = inputs
+        destination = get_move_destination(self._project, self._move, destination)
+        resources = None if scope is None else get_scope_resources(scope)
+        return self._move.get_changes(
+            destination,
+            resources=get_move_resources(self._move, destination, resources),
+            task_handle=task_handle,
+        )
@@ -11,18 +11,21 @@
 """
 The dialog that perform renaming.
 """
+import functools
 import logging
 from typing import Union
 
-from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtCore import QThreadPool, QTimer, pyqtSlot
 from PyQt6.QtWidgets import QWidget
 from rope.base.resources import Resource
 from rope.base.project import Project
-from rope.refactor.rename import Rename
 from rope.base.change import ChangeSet
+from rope.base.taskhandle import DEFAULT_TASK_HANDLE, BaseTaskHandle
 
+from refactorings import OccurrenceRename, get_scope_resources
 from ui.generated.ui_rename import Ui_Dialog
 from ui.base import IdentifierRefactorDialog
+from workers import RopeTask
 
 
 class RenameDialog(IdentifierRefactorDialog):
@@ -30,17 +33,27 @@ class RenameDialog(IdentifierRefactorDialog):
     The dialog that perform renaming.
     """
 
+    # Milliseconds of typing inactivity before a live preview starts.
+    live_preview_delay = 300
+
     def __init__(
         self,
         parent: QWidget,
         project: Project,
         resource: Resource,
         offset: Union[None, int],
+        folders: Union[None, list[Resource]] = None,
     ):
-        super().__init__(parent, project, resource, offset)
+        super().__init__(parent, project, resource, offset, folders)
 
         # Initialize data context
-        self._rename = Rename(self._project, self._resource, self._offset)
+        with self._project_lock:
+            self._rename = OccurrenceRename(
+                self._project,
+                self._resource,
+                self._offset,
+                self._project.prefs.get("rename_processes", 0),
+            )
         logging.info("Rename on %s.", self._resource.path)
 
         # Initialize the interface
@@ -48,17 +61,80 @@ class RenameDialog(IdentifierRefactorDialog):
         self._ui.setupUi(self)
 
         self._ui.lineEdit_module.setText(self._resource.path)
+        self._setup_scope()
+        self.count_affected()
+
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(self.live_preview_delay)
+        self._preview_timer.timeout.connect(self.preview)
+
+        # Find the occurrences in the background, each preview only substitutes them.
+        self._search = RopeTask(
+            functools.partial(
+                self._rename.find_occurrences, self._ui.checkBox.isChecked(), None
+            ),
+            "Find Occurrences",
+            self._project_lock,
+        )
+        self._search.signals.progress.connect(self._show_progress)
+        self._search.signals.finished.connect(self._finish_search)
+        self._search.signals.failed.connect(self._finish_search)
+        self._search.signals.cancelled.connect(self._finish_search)
+        QThreadPool.globalInstance().start(self._search)
+
+    def done(self, a0: int):
+        self._search.stop()
+        super().done(a0)
+
+    @pyqtSlot()
+    def _finish_search(self):
+        if self._task is None:
+            self._ui.progressBar.setRange(0, 100)
+            self._ui.progressBar.setValue(0)
 
     @pyqtSlot()
-    def preview(self):
-        self._ui.plainTextEdit.setPlainText(self._description)
+    def change_scope(self):
+        # The whole project search would hold the occurrences lock.
+        self._search.stop()
+        super().change_scope()
+
+    @pyqtSlot()
+    def schedule_preview(self):
+        """
+        In live preview mode, preview once the user stops typing.
+        Each keystroke restarts the delay, so only the latest name is analyzed.
+        """
+        if not self._ui.checkBox_live.isChecked() or not self._new_name:
+            self._preview_timer.stop()
+            return
+
+        self._preview_timer.start()
 
     @property
     def _new_name(self) -> str:
         return self._ui.lineEdit_new_name.text()
 
     @property
-    def _changes(self) -> ChangeSet:
+    def _inputs(self) -> tuple[str, bool, Union[None, tuple[Resource, ...]]]:
+        return self._new_name, self._ui.checkBox.isChecked(), self._scope
+
+    def _get_affected(
+        self,
+        inputs: tuple[str, bool, Union[None, tuple[Resource, ...]]],
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> list[Resource]:
+        _, docs, scope = inputs
+        resources = None if scope is None else get_scope_resources(scope)
+        return self._rename.get_affected_resources(docs, resources)
+
+    def _get_changes(
+        self,
+        inputs: tuple[str, bool, Union[None, tuple[Resource, ...]]],
+        task_handle: BaseTaskHandle = DEFAULT_TASK_HANDLE,
+    ) -> ChangeSet:
+        new_name, docs, scope = inputs
+        resources = None if scope is None else get_scope_resources(scope)
         return self._rename.get_changes(
-            self._new_name, docs=self._ui.checkBox.isChecked()
+            new_name, docs=docs, resources=resources, task_handle=task_handle
         )
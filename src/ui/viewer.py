@@ -0,0 +1,151 @@
+# -------------------------------------------------------------------------------
+# Name:        viewer
+# Purpose:     Display the source code of modules, however large.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Display the source code of modules, however large.
+"""
+import logging
+import os
+from typing import Union
+
+from PyQt6.QtCore import QObject, pyqtSlot
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+from rope.base.change import Change
+from rope.base.resources import Resource
+
+from sources import SourceCache, SourceDocument
+
+
+class SourceViewer(QObject):
+    """
+    Display modules in a `QPlainTextEdit`.
+
+    Modules larger than `large_file_size` are memory-mapped and only a window of
+    `window_lines` lines is rendered. The window slides when the view is scrolled
+    near one of its edges, after mapping the module again if it was modified.
+    Smaller modules are kept in a `SourceCache`, so switching between them is instant.
+    """
+
+    large_file_size = 1 << 20
+    window_lines = 2000
+
+    def __init__(self, text_edit: QPlainTextEdit, parent: Union[None, QObject] = None):
+        super().__init__(parent)
+
+        self._text_edit = text_edit
+        self._resource: Union[None, Resource] = None
+        self._document: Union[None, SourceDocument] = None
+        # First line of the window.
+        self._first = 0
+        self._cache = SourceCache()
+
+        text_edit.verticalScrollBar().valueChanged.connect(self._slide_window)
+
+    def show_resource(self, resource: Resource, keep_position: bool = False):
+        """
+        Display the module `resource`, at the same scroll position if `keep_position`.
+        """
+        line = self._get_top_line() if keep_position else 0
+        self.clear()
+        self._resource = resource
+
+        path = resource.real_path
+        if (
+            os.path.getsize(path) <= self.large_file_size
+            or not SourceDocument.is_supported(path)
+        ):
+            self._set_text(self._cache.read(resource), line)
+            return
+
+        self._document = SourceDocument(path)
+        logging.info(
+            "Module %s mapped: %d lines.", resource.path, self._document.line_count
+        )
+        self._show_window(line)
+
+    def update(self, changes: Change):
+        """
+        Forget the cached modules touched by the performed `changes`.
+        """
+        self._cache.update(changes)
+
+    def clear(self):
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+        self._resource = None
+        self._first = 0
+        self._text_edit.clear()
+
+    def get_offset(self, position: int) -> int:
+        """
+        Get the rope offset of the cursor `position` in the text edit.
+        """
+        if self._document is None:
+            return position
+        return self._document.get_offset(self._first) + position
+
+    def _get_top_line(self) -> int:
+        return self._first + self._text_edit.verticalScrollBar().value()
+
+    def _set_text(self, text: str, line: int):
+        self._text_edit.setPlainText(text)
+        self._text_edit.verticalScrollBar().setValue(line)
+
+    def _show_window(self, line: int):
+        """
+        Render the window of lines around `line` and scroll to it.
+        The selection is kept if it is still inside the window.
+        """
+        cursor = self._text_edit.textCursor()
+        start = self.get_offset(cursor.anchor())
+        end = self.get_offset(cursor.position())
+
+        count = self._document.line_count
+        first = max(min(line - self.window_lines // 2, count - self.window_lines), 0)
+        self._first = first
+        text = self._document.get_lines(first, first + self.window_lines)
+
+        scroll_bar = self._text_edit.verticalScrollBar()
+        scroll_bar.blockSignals(True)
+        self._text_edit.setPlainText(text)
+
+        start -= self._document.get_offset(first)
+        end -= self._document.get_offset(first)
+        if 0 <= start <= len(text) and 0 <= end <= len(text):
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            self._text_edit.setTextCursor(cursor)
+
+        scroll_bar.setValue(line - first)
+        scroll_bar.blockSignals(False)
+
+    @pyqtSlot(int)
+    def _slide_window(self, value: int):
+        if self._document is None:
+            return
+        if self._document.is_modified():
+            resource = self._resource
+            if os.path.isfile(resource.real_path):
+                self.show_resource(resource, keep_position=True)
+            else:
+                self.clear()
+            return
+
+        scroll_bar = self._text_edit.verticalScrollBar()
+        margin = self.window_lines // 10
+        at_top = value < margin and self._first > 0
+        at_bottom = (
+            value > scroll_bar.maximum() - margin
+            and self._first + self.window_lines < self._document.line_count
+        )
+        if at_top or at_bottom:
+            self._show_window(self._first + value)
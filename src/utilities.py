@@ -11,14 +11,34 @@
 """
 Provides commonly used utilities.
 """
+import heapq
+import importlib
+import multiprocessing
+import os
 import re
-from typing import Generator
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Union
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QStandardItem, QStandardItemModel
 from rope.base import libutils
-from rope.base.resources import Resource
+from rope.base.change import (
+    Change,
+    ChangeSet,
+    CreateResource,
+    MoveResource,
+    RemoveResource,
+)
 from rope.base.project import Project
+from rope.base.resources import Resource
+
+
+def import_object(path: str) -> Any:
+    """
+    Import an object from its dotted `path`, such as `ui.rename.RenameDialog`.
+    """
+    module_name, _, name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), name)
 
 
 def is_validate_resource(resource: Resource) -> bool:
@@ -27,55 +47,141 @@ def is_validate_resource(resource: Resource) -> bool:
     Folders starting and ending with `__` will be ignored.
     """
     if resource.is_folder():
-        if re.match(r"^(__.+__)$", resource.name):
-            return False
-        return True
+        name = resource.name
+        return not (len(name) > 4 and name.startswith("__") and name.endswith("__"))
 
     project = resource.project
     return libutils.is_python_file(project, resource)
 
 
-def _recursive_traversal(resource: Resource, root_item: QStandardItem):
+def get_validate_children(folder: Resource) -> list[Resource]:
     """
-    With `resource` as the root, recursively traverse all valid resources under `resource`.
-    Adds child nodes to `root_item` as the root node.
+    Get the valid resources directly under `folder`.
+    Rope is called holding the project lock, see `get_project_lock`, so a thread
+    walking the project holds it for one folder at a time.
     """
-    if resource.is_folder():
-        children = (
-            child for child in resource.get_children() if is_validate_resource(child)
-        )
-    else:
-        return
+    with get_project_lock(folder.project):
+        return [
+            child for child in folder.get_children() if is_validate_resource(child)
+        ]
+
 
-    for child in children:
-        item = QStandardItem(child.name)
-        item.setEditable(False)
-        item.setData(child.path, Qt.ItemDataRole.ToolTipRole)
+def get_changed_folders(changes: Change) -> set[Resource]:
+    """
+    Get the folders whose children are altered by `changes`.
+    Changes to file contents do not alter any folder.
+    """
+    if isinstance(changes, ChangeSet):
+        folders = set()
+        for change in changes.changes:
+            folders.update(get_changed_folders(change))
+        return folders
+
+    if isinstance(changes, MoveResource):
+        return {changes.resource.parent, changes.new_resource.parent}
+    if isinstance(changes, (CreateResource, RemoveResource)):
+        return {changes.resource.parent}
+    return set()
 
-        root_item.appendRow(item)
 
-        if child.is_folder():
-            _recursive_traversal(child, item)
+def get_changes(changes: Change) -> list[Change]:
+    """
+    Get the changes of `changes` that are not change sets, in order.
+    """
+    if isinstance(changes, ChangeSet):
+        result = []
+        for change in changes.changes:
+            result.extend(get_changes(change))
+        return result
+    return [changes]
 
 
-def get_project_model(root_resource: Resource) -> QStandardItemModel:
+def get_modification_times(paths: Iterable[str]) -> dict[str, Union[None, int]]:
     """
-    Take `root_resource` as the root, traverse all valid files under it, and compose the tree model.
+    Get the modification times of `paths`, `None` for the ones that do not exist.
     """
-    model = QStandardItemModel()
-    root_item = model.invisibleRootItem()
-    _recursive_traversal(root_resource, root_item)
-    return model
+    times = {}
+    for path in paths:
+        try:
+            times[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            times[path] = None
+    return times
 
 
-def get_packages(project: Project) -> Generator[Resource, None, None]:
-    for module in project.get_python_files():
-        if module.name == "__init__.py":
-            yield module.parent
+_project_locks: "weakref.WeakKeyDictionary[Project, threading.RLock]" = (
+    weakref.WeakKeyDictionary()
+)
+_project_locks_lock = threading.Lock()
+
+
+def get_project_lock(project: Project) -> threading.RLock:
+    """
+    Get the lock every thread holds while calling rope on `project`,
+    since the caches of rope, such as the list of python files, are not thread safe.
+    """
+    with _project_locks_lock:
+        lock = _project_locks.get(project)
+        if lock is None:
+            lock = _project_locks[project] = threading.RLock()
+    return lock
 
-    yield project.root
 
+# Process pools by number of processes, kept for the next tasks.
+_process_pools: dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+
+def get_process_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Get the pool of `processes` worker processes, shared by the whole application.
+    The workers are spawned, not forked, since the GUI process runs threads.
+    """
+    with _process_pools_lock:
+        pool = _process_pools.get(processes)
+        if pool is None:
+            context = multiprocessing.get_context("spawn")
+            pool = _process_pools[processes] = ProcessPoolExecutor(processes, context)
+    return pool
+
+
+def get_fuzzy_pattern(text: str) -> re.Pattern:
+    """
+    Compile a pattern matching the characters of `text` in order, ignoring case.
+    """
+    # `a[^b]*b` rather than `a.*?b` matches the earliest occurrences without backtracking.
+    parts = [re.escape(text[0])] if text else []
+    for char in text[1:]:
+        parts.append(f"[^{re.escape(char.lower())}{re.escape(char.upper())}]*")
+        parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def fuzzy_filter(text: str, items: Iterable[str]) -> list[str]:
+    """
+    Get the `items` containing the characters of `text` in order.
+    """
+    search = get_fuzzy_pattern(text).search
+    return [item for item in items if search(item)]
+
+
+def fuzzy_rank(text: str, matches: Iterable[str], limit: int) -> list[str]:
+    """
+    Get the `limit` best of the `matches` of `text`. Exact substrings of the last
+    path segment come first, then exact substrings, then the most compact
+    and shortest matches. Ties keep the order of `matches`.
+    """
+    search = get_fuzzy_pattern(text).search
+    text = text.lower()
+
+    def key(item: str) -> tuple:
+        match = search(item)
+        lowered = item.lower()
+        return (
+            text not in lowered[lowered.rfind("/") + 1 :],
+            text not in lowered,
+            match.end() - match.start(),
+            len(item),
+        )
 
-def get_modules(project: Project) -> Generator[Resource, None, None]:
-    for module in project.get_python_files():
-        yield module
+    return heapq.nsmallest(limit, matches, key=key)
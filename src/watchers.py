@@ -0,0 +1,145 @@
+# -------------------------------------------------------------------------------
+# Name:        watchers
+# Purpose:     Watch the project for changes made by other programs.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Watch the project for changes made by other programs, such as `git checkout`
+or a formatter, so only the altered folders need to be validated.
+"""
+import logging
+import os
+from typing import Iterable, Union
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal, pyqtSlot
+from rope.base.exceptions import ResourceNotFoundError
+from rope.base.project import Project
+from rope.base.resources import Resource
+
+from utilities import get_validate_children
+
+
+class ProjectWatcher(QObject):
+    """
+    Watch the listed folders of a project, and the module being displayed.
+
+    Notifications are collected for `delay` milliseconds, so a burst of changes,
+    e.g. a checkout, is reported once.
+
+    - folders_changed: A list of the folders whose entries were altered.
+    - file_changed: The watched module, whose contents were altered.
+    """
+
+    folders_changed = pyqtSignal(list)
+    file_changed = pyqtSignal(object)
+
+    delay = 200
+
+    def __init__(self, project: Project, parent: Union[None, QObject] = None):
+        super().__init__(parent)
+
+        self._project = project
+        self._dirty: set[str] = set()
+        self._file: Union[None, Resource] = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._collect)
+        self._watcher.fileChanged.connect(self._report_file)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.delay)
+        self._timer.timeout.connect(self._flush)
+
+        self.watch([project.root])
+
+    def watch(self, folders: Iterable[Resource]):
+        """
+        Watch `folders`, the ones already watched are skipped.
+        """
+        watched = set(self._watcher.directories())
+        paths = [
+            folder.real_path for folder in folders if folder.real_path not in watched
+        ]
+        if paths:
+            failed = self._watcher.addPaths(paths)
+            if failed:
+                logging.warning(
+                    "Unable to watch %d folders, e.g. %s.", len(failed), failed[0]
+                )
+
+    @pyqtSlot(list)
+    def watch_listings(self, listings: list[tuple[Resource, list[Resource]]]):
+        """
+        Watch the folders listed by a `ProjectScanner`.
+        """
+        self.watch(folder for folder, _ in listings)
+
+    def watch_file(self, resource: Union[None, Resource]):
+        """
+        Watch the module `resource` instead of the previous one, `None` to stop.
+        """
+        if self._file is not None and self._file.real_path in self._watcher.files():
+            self._watcher.removePath(self._file.real_path)
+        self._file = resource
+        if resource is not None:
+            self._watcher.addPath(resource.real_path)
+
+    @pyqtSlot(str)
+    def _collect(self, path: str):
+        self._dirty.add(path)
+        self._timer.start()
+
+    @pyqtSlot(str)
+    def _report_file(self, path: str):
+        if self._file is None or path != self._file.real_path:
+            return
+
+        # Editors that replace the file make it unwatched.
+        if os.path.isfile(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        self.file_changed.emit(self._file)
+
+    @pyqtSlot()
+    def _flush(self):
+        """
+        Report the altered folders that still exist, and watch their new subfolders.
+        Removed folders are reported through their parents.
+        """
+        folders = []
+        for path in sorted(self._dirty):
+            if not os.path.isdir(path):
+                continue
+            relative = os.path.relpath(path, self._project.address)
+            try:
+                folder = self._project.get_folder(
+                    "" if relative == "." else relative.replace(os.sep, "/")
+                )
+            except ResourceNotFoundError:
+                continue
+            folders.append(folder)
+        self._dirty.clear()
+
+        if folders:
+            self.watch(self._get_subfolders(folders))
+            logging.info("Folders changed: %s.", [folder.path for folder in folders])
+            self.folders_changed.emit(folders)
+
+    def _get_subfolders(self, folders: list[Resource]) -> list[Resource]:
+        """
+        Get the subfolders of `folders` not watched yet, and everything under them.
+        """
+        watched = set(self._watcher.directories())
+        result = []
+        stack = list(folders)
+        while stack:
+            for child in get_validate_children(stack.pop()):
+                if child.is_folder() and child.real_path not in watched:
+                    result.append(child)
+                    stack.append(child)
+        return result
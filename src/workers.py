@@ -0,0 +1,231 @@
+# -------------------------------------------------------------------------------
+# Name:        workers
+# Purpose:     Background tasks run in the thread pool.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Background tasks run in the thread pool.
+Tasks report to the GUI thread through the signals of their `signals` attribute.
+
+Interactive tasks run in the global thread pool, the previews in the preview
+pool, see `get_preview_pool`, and the long-running jobs in the background pool,
+see `get_background_pool`.
+"""
+import contextlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Union
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from rope.base.exceptions import InterruptedTaskError
+from rope.base.resources import Resource
+from rope.base.taskhandle import TaskHandle
+
+from utilities import get_validate_children
+
+# Scanning, loading the module index, summarizing and analyzing run together.
+BACKGROUND_THREADS = 4
+
+# Thread pools by name, see `get_background_pool` and `get_preview_pool`.
+_thread_pools: dict[str, QThreadPool] = {}
+
+
+def _get_thread_pool(name: str, threads: int) -> QThreadPool:
+    pool = _thread_pools.get(name)
+    if pool is None:
+        pool = _thread_pools[name] = QThreadPool()
+        pool.setMaxThreadCount(threads)
+    return pool
+
+
+def get_background_pool() -> QThreadPool:
+    """
+    Get the thread pool of the long-running jobs, such as scanning the project,
+    so the interactive tasks of the global thread pool do not queue behind them
+    on machines with few cores.
+    """
+    return _get_thread_pool("background", BACKGROUND_THREADS)
+
+
+def get_preview_pool() -> QThreadPool:
+    """
+    Get the thread pool of the previews. It has a single thread, so a preview
+    starts once the cancelled one has left rope.
+    """
+    return _get_thread_pool("preview", 1)
+
+
+class ScannerSignals(QObject):
+    """
+    Signals emitted by `ProjectScanner`.
+
+    - batch: A list of `(folder, children)` listings.
+    - progress: Number of folders and modules discovered so far.
+    - finished: Number of folders and modules discovered in total.
+    """
+
+    batch = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, int)
+
+
+class ProjectScanner(QRunnable):
+    """
+    Walk the project breadth first and stream the folder listings in batches,
+    so the tree can be populated while the window stays responsive.
+    Each folder is listed holding the project lock, see `get_validate_children`.
+    """
+
+    # Seconds between two batches.
+    interval = 0.1
+
+    def __init__(self, root_resource: Resource):
+        super().__init__()
+
+        self.signals = ScannerSignals()
+        self._root = root_resource
+        self._stopped = False
+
+    def stop(self):
+        """
+        Stop scanning as soon as possible. No more signals will be emitted.
+        """
+        self._stopped = True
+
+    def run(self):
+        folders = modules = 0
+        listings: list[tuple[Resource, list[Resource]]] = []
+        deadline = time.monotonic() + self.interval
+        queue = deque([self._root])
+
+        while queue and not self._stopped:
+            folder = queue.popleft()
+            children = get_validate_children(folder)
+            listings.append((folder, children))
+
+            for child in children:
+                if child.is_folder():
+                    folders += 1
+                    queue.append(child)
+                else:
+                    modules += 1
+
+            if time.monotonic() >= deadline:
+                self.signals.batch.emit(listings)
+                self.signals.progress.emit(folders, modules)
+                listings = []
+                deadline = time.monotonic() + self.interval
+
+        if self._stopped:
+            logging.info("Scan of <%s> stopped.", self._root.real_path)
+            return
+
+        self.signals.batch.emit(listings)
+        self.signals.finished.emit(folders, modules)
+        logging.info(
+            "Scan of <%s> finished: %d folders, %d modules.",
+            self._root.real_path,
+            folders,
+            modules,
+        )
+
+
+class TaskSignals(QObject):
+    """
+    Signals emitted by `RopeTask`.
+
+    - progress: Percentage done of the current job set, -1 if unknown.
+    - finished: The result of the task.
+    - failed: The exception raised by the task.
+    - cancelled: The task was stopped before finishing.
+    """
+
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+
+class RopeTask(QRunnable):
+    """
+    Run a rope operation that accepts a `TaskHandle`, such as
+    `Rename.get_changes(..., task_handle=...)`, reporting its progress.
+    With a `lock`, see `get_project_lock`, the operation runs holding it.
+    """
+
+    def __init__(
+        self,
+        function: Callable[[TaskHandle], Any],
+        name: str = "Task",
+        lock: Union[None, threading.RLock] = None,
+    ):
+        super().__init__()
+
+        self.signals = TaskSignals()
+        self._function = function
+        self._lock = lock
+        self._state_lock = threading.Lock()
+        self._started = False
+        self._done = threading.Event()
+        self._handle = TaskHandle(name)
+        self._handle.add_observer(self._report)
+
+    def stop(self):
+        """
+        Interrupt the operation at the next job, `cancelled` will be emitted.
+        """
+        self._handle.stop()
+
+    def wait(self):
+        """
+        Block until the stopped task is done.
+        It returns at once if the task has not started, it will then never run.
+        """
+        with self._state_lock:
+            started = self._started
+        if started:
+            self._done.wait()
+
+    def _report(self):
+        if self._handle.is_stopped():
+            return
+
+        jobset = self._handle.current_jobset()
+        percent = None if jobset is None else jobset.get_percent_done()
+        self.signals.progress.emit(-1 if percent is None else int(percent))
+
+    def run(self):
+        with self._state_lock:
+            if self._handle.is_stopped():
+                self.signals.cancelled.emit()
+                return
+            self._started = True
+
+        try:
+            self._run()
+        finally:
+            self._done.set()
+
+    def _run(self):
+        try:
+            with self._lock or contextlib.nullcontext():
+                result = self._function(self._handle)
+        except InterruptedTaskError:
+            self.signals.cancelled.emit()
+            return
+        except Exception as exception:  # pylint:disable=broad-exception-caught
+            logging.exception("Task <%s> failed.", self._handle.name)
+            self.signals.failed.emit(exception)
+            return
+
+        if self._handle.is_stopped():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
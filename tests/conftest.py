@@ -0,0 +1,45 @@
+# -------------------------------------------------------------------------------
+# Name:        conftest
+# Purpose:     Shared fixtures of the tests.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Shared fixtures of the tests.
+The modules under test are imported from `src`, like `main.py` does.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# pylint:disable=wrong-import-position
+from pruning import open_project  # noqa: E402
+
+
+@pytest.fixture
+def make_project(tmp_path):
+    """
+    Open a rope project in a temporary folder containing `files`,
+    contents by project path.
+    """
+    projects = []
+
+    def make(files: dict[str, str]):
+        for path, text in files.items():
+            real_path = tmp_path.joinpath(*path.split("/"))
+            real_path.parent.mkdir(parents=True, exist_ok=True)
+            real_path.write_text(text, encoding="utf-8")
+        project = open_project(str(tmp_path), ropefolder=None)
+        projects.append(project)
+        return project
+
+    yield make
+    for project in projects:
+        project.close()
@@ -0,0 +1,31 @@
+# -------------------------------------------------------------------------------
+# Name:        test_pruning
+# Purpose:     Tests of the pruning of ignored resources.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Tests of the pruning of ignored resources.
+"""
+import os
+
+from indexes import get_module_index
+from pruning import get_pruner
+
+
+def test_modified_gitignore_is_read_again(make_project):
+    project = make_project({"a/x.py": "", "a/build/y.py": "", "z.py": ""})
+    index = get_module_index(project)
+    assert index.get_modules() == ["a/build/y.py", "a/x.py", "z.py"]
+    assert get_pruner(project).refresh() == []
+
+    with open(os.path.join(project.address, "a", ".gitignore"), "w") as file:
+        file.write("build/\n")
+    assert get_pruner(project).refresh() == ["a"]
+
+    index.rebuild(project.get_folder("a"))
+    assert index.get_modules() == ["a/x.py", "z.py"]
@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------------------
+# Name:        test_refactorings
+# Purpose:     Tests of the refactoring engines.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Tests of the refactoring engines.
+"""
+import os
+
+from refactorings import OccurrenceRename
+
+
+def _touch(project, path: str, text: str):
+    """
+    Rewrite the module at `path` behind rope's back, like another program would,
+    with a later modification time.
+    """
+    real_path = project.get_resource(path).real_path
+    stat = os.stat(real_path)
+    with open(real_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.utime(real_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    project.validate()
+
+
+def _get_paths(rename: OccurrenceRename) -> list[str]:
+    return sorted(occurrence.resource.path for occurrence in rename.find_occurrences())
+
+
+def test_rename_finds_occurrences_in_modified_modules(make_project):
+    project = make_project(
+        {
+            "a.py": "def foo():\n    pass\n",
+            "b.py": "from a import foo\nfoo()\n",
+            "c.py": "x = 1\n",
+        }
+    )
+    resource = project.get_resource("a.py")
+    rename = OccurrenceRename(project, resource, resource.read().index("foo"))
+    assert _get_paths(rename) == ["a.py", "b.py"]
+
+    # A module without occurrences starts using the renamed function.
+    _touch(project, "c.py", "from a import foo\nfoo()\n")
+    assert _get_paths(rename) == ["a.py", "b.py", "c.py"]
+
+    changes = rename.get_changes("bar")
+    assert sorted(r.path for r in changes.get_changed_resources()) == [
+        "a.py",
+        "b.py",
+        "c.py",
+    ]
+
+
+def test_rename_reuses_occurrences_of_unmodified_project(make_project):
+    project = make_project(
+        {"a.py": "def foo():\n    pass\n", "b.py": "from a import foo\nfoo()\n"}
+    )
+    resource = project.get_resource("a.py")
+    rename = OccurrenceRename(project, resource, resource.read().index("foo"))
+    assert rename.find_occurrences() is rename.find_occurrences()
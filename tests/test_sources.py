@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------
+# Name:        test_sources
+# Purpose:     Tests of the reading of module sources.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Tests of the reading of module sources.
+"""
+from sources import SourceDocument
+
+# Past the head read for the encoding declaration.
+_PADDING = b"x = 1\n" * 20000
+
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "module.py"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_is_supported(tmp_path):
+    assert SourceDocument.is_supported(_write(tmp_path, _PADDING + "é\r\n".encode()))
+    assert SourceDocument.is_supported(_write(tmp_path, b""))
+
+
+def test_is_not_supported_with_lone_carriage_return(tmp_path):
+    assert not SourceDocument.is_supported(_write(tmp_path, _PADDING + b"y = 2\r"))
+
+
+def test_is_not_supported_with_invalid_utf8(tmp_path):
+    assert not SourceDocument.is_supported(_write(tmp_path, _PADDING + b"# \xe9\n"))
+    assert not SourceDocument.is_supported(
+        _write(tmp_path, b"# coding: ascii\n" + _PADDING + "é\n".encode())
+    )
+
+
+def test_offsets_match_rope(tmp_path):
+    path = _write(tmp_path, "a = 'é'\r\nb = 1\r\nc = 2\r\n".encode())
+    document = SourceDocument(path)
+    try:
+        assert document.line_count == 3
+        assert document.get_offset(1) == len("a = 'é'\n")
+        assert document.get_lines(1, 3) == "b = 1\nc = 2\n"
+    finally:
+        document.close()
+
+
+def test_is_modified_once_truncated(tmp_path):
+    path = _write(tmp_path, _PADDING)
+    document = SourceDocument(path)
+    try:
+        assert not document.is_modified()
+        with open(path, "r+b") as file:
+            file.truncate(10)
+        assert document.is_modified()
+    finally:
+        document.close()
@@ -0,0 +1,65 @@
+# -------------------------------------------------------------------------------
+# Name:        test_summaries
+# Purpose:     Tests of the module summaries.
+#
+# Author:      chenjunhan
+#
+# Created:     17/10/2026
+# Copyright:   (c) chenjunhan 2026
+# Licence:     MIT
+# -------------------------------------------------------------------------------
+"""
+Tests of the module summaries.
+"""
+import os
+
+from pruning import open_project
+from summaries import ModuleSummaries, get_module_summaries
+
+
+def test_corrupted_database_is_built_again(tmp_path):
+    (tmp_path / "a.py").write_text("import b\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    ropefolder = tmp_path / ".ropeproject"
+    ropefolder.mkdir()
+    (ropefolder / ModuleSummaries.data_name).write_bytes(b"not a database" * 100)
+
+    project = open_project(str(tmp_path))
+    try:
+        summaries = get_module_summaries(project)
+        assert summaries.build() == 2
+        assert summaries.get_importers(
+            [project.get_resource("b.py")], project.get_python_files()
+        ) == {"a.py"}
+
+        summaries.close()
+        assert summaries.closed
+        reopened = get_module_summaries(project)
+        assert reopened is not summaries
+        assert reopened.build() == 0
+        reopened.close()
+    finally:
+        project.close()
+
+
+def test_database_in_memory_without_rope_folder(make_project):
+    project = make_project({"a.py": "x = 1\n"})
+    summaries = get_module_summaries(project)
+    assert summaries.build() == 1
+    summaries.close()
+    assert not os.path.exists(os.path.join(project.address, ":memory:"))
+
+
+def test_star_import_of_package_imports_its_modules(make_project):
+    project = make_project(
+        {
+            "pkg/__init__.py": "__all__ = ['sub']\n",
+            "pkg/sub.py": "def foo():\n    pass\n",
+            "user.py": "from pkg import *\nsub.foo()\n",
+            "other.py": "import os\n",
+        }
+    )
+    importers = get_module_summaries(project).get_importers(
+        [project.get_resource("pkg/sub.py")], project.get_python_files()
+    )
+    assert importers == {"user.py"}